@@ -4,6 +4,7 @@ from typing import Dict, Any
 import structlog
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from supabase import Client
 
 from ..supabase_client import get_supabase_client
 from ..openai_client import get_openai_client
@@ -12,9 +13,17 @@ logger = structlog.get_logger(__name__)
 security = HTTPBearer()
 
 
+async def get_supabase() -> Client:
+    """FastAPI dependency for the shared Supabase client.
+
+    Declared async so FastAPI calls it inline instead of via the threadpool.
+    """
+    return get_supabase_client()
+
+
 async def get_current_user(
     request: Request,
-    supabase=Depends(get_supabase_client)
+    supabase=Depends(get_supabase)
 ) -> Dict[str, Any]:
     """Get the current user - simplified for single user setup."""
     # For single user setup, we'll use a fixed user ID
@@ -1,6 +1,6 @@
 """API routes for managing coding preferences and signals."""
 
-import json
+import asyncio
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from enum import Enum
@@ -9,9 +9,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 import structlog
 
-from ..dependencies import get_current_user
-from ...supabase_client import get_supabase_client
+from ..dependencies import get_current_user, get_supabase
 from ...openai_client import get_openai_client
+from ...services.embedding_service import canonical_signal_data, get_embedding_service
 
 # Real Supabase integration
 
@@ -70,6 +70,14 @@ class CodingSignalCreate(BaseModel):
     confidence_score: float = Field(1.0, ge=0.0, le=1.0)
 
 
+class CodingPreferenceBulkCreate(BaseModel):
+    items: List[CodingPreferenceCreate] = Field(..., min_length=1, max_length=100)
+
+
+class CodingSignalBulkCreate(BaseModel):
+    items: List[CodingSignalCreate] = Field(..., min_length=1, max_length=100)
+
+
 class SimilaritySearchRequest(BaseModel):
     query_text: str = Field(..., description="Text to find similar preferences for")
     similarity_threshold: float = Field(0.7, ge=0.0, le=1.0)
@@ -91,7 +99,7 @@ class CodingStyleSummary(BaseModel):
 async def create_coding_preference(
     preference: CodingPreferenceCreate,
     current_user: dict = Depends(get_current_user),
-    supabase=Depends(get_supabase_client),
+    supabase=Depends(get_supabase),
     openai=Depends(get_openai_client)
 ):
     """Create a new coding preference with automatic embedding generation."""
@@ -124,17 +132,57 @@ async def create_coding_preference(
         )
 
 
+@router.post("/bulk", response_model=List[CodingPreferenceResponse])
+async def create_coding_preferences_bulk(
+    request: CodingPreferenceBulkCreate,
+    current_user: dict = Depends(get_current_user),
+    supabase=Depends(get_supabase)
+):
+    """Create several coding preferences in a single insert."""
+    try:
+        user_id = current_user["id"]
+        
+        result = supabase.table("coding_preferences").insert([
+            {
+                "user_id": user_id,
+                "category": preference.category,
+                "preference_text": preference.preference_text,
+                "context": preference.context,
+                "strength": preference.strength,
+                "metadata": preference.metadata
+            }
+            for preference in request.items
+        ]).execute()
+        
+        if not result.data:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create coding preferences"
+            )
+        
+        return [CodingPreferenceResponse(**row) for row in result.data]
+        
+    except Exception as e:
+        logger.error("Failed to create coding preferences", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create coding preferences: {str(e)}"
+        )
+
+
 @router.get("/", response_model=List[CodingPreferenceResponse])
 async def get_coding_preferences(
     category: Optional[PreferenceCategory] = None,
     current_user: dict = Depends(get_current_user),
-    supabase=Depends(get_supabase_client)
+    supabase=Depends(get_supabase)
 ):
     """Get all coding preferences for the current user, optionally filtered by category."""
     try:
         user_id = current_user["id"]
         
-        query = supabase.table("coding_preferences").select("*").eq("user_id", user_id)
+        query = supabase.table("coding_preferences").select(
+            "id, category, preference_text, context, strength, metadata, created_at, updated_at"
+        ).eq("user_id", user_id)
         
         if category:
             query = query.eq("category", category)
@@ -154,7 +202,7 @@ async def get_coding_preferences(
 @router.get("/summary", response_model=List[CodingStyleSummary])
 async def get_coding_style_summary(
     current_user: dict = Depends(get_current_user),
-    supabase=Depends(get_supabase_client)
+    supabase=Depends(get_supabase)
 ):
     """Get a summary of the user's coding style preferences by category."""
     try:
@@ -179,7 +227,7 @@ async def update_coding_preference(
     preference_id: str,
     preference_update: CodingPreferenceUpdate,
     current_user: dict = Depends(get_current_user),
-    supabase=Depends(get_supabase_client),
+    supabase=Depends(get_supabase),
     openai=Depends(get_openai_client)
 ):
     """Update an existing coding preference."""
@@ -187,7 +235,7 @@ async def update_coding_preference(
         user_id = current_user["id"]
         
         # Get current preference
-        current_result = supabase.table("coding_preferences").select("*").eq("id", preference_id).eq("user_id", user_id).execute()
+        current_result = supabase.table("coding_preferences").select("preference_text, context").eq("id", preference_id).eq("user_id", user_id).execute()
         
         if not current_result.data:
             raise HTTPException(
@@ -235,7 +283,7 @@ async def update_coding_preference(
 async def delete_coding_preference(
     preference_id: str,
     current_user: dict = Depends(get_current_user),
-    supabase=Depends(get_supabase_client)
+    supabase=Depends(get_supabase)
 ):
     """Delete a coding preference."""
     try:
@@ -265,7 +313,7 @@ async def delete_coding_preference(
 async def search_similar_preferences(
     search_request: SimilaritySearchRequest,
     current_user: dict = Depends(get_current_user),
-    supabase=Depends(get_supabase_client),
+    supabase=Depends(get_supabase),
     openai=Depends(get_openai_client)
 ):
     """Search for similar coding preferences using vector similarity."""
@@ -320,7 +368,7 @@ async def search_similar_preferences(
 async def create_coding_signal(
     signal: CodingSignalCreate,
     current_user: dict = Depends(get_current_user),
-    supabase=Depends(get_supabase_client),
+    supabase=Depends(get_supabase),
     openai=Depends(get_openai_client)
 ):
     """Create a coding signal (behavioral data) with automatic embedding generation."""
@@ -328,7 +376,7 @@ async def create_coding_signal(
         user_id = current_user["id"]
         
         # Generate embedding for the signal data
-        signal_text = f"{signal.signal_type}: {json.dumps(signal.signal_data)}"
+        signal_text = f"{signal.signal_type}: {canonical_signal_data(signal.signal_data)}"
         embedding = await generate_preference_embedding(signal_text, None, openai)
         
         # Insert signal into database
@@ -356,6 +404,55 @@ async def create_coding_signal(
         )
 
 
+@router.post("/signals/bulk")
+async def create_coding_signals_bulk(
+    request: CodingSignalBulkCreate,
+    current_user: dict = Depends(get_current_user),
+    supabase=Depends(get_supabase),
+    openai=Depends(get_openai_client)
+):
+    """Create several coding signals in a single insert."""
+    try:
+        user_id = current_user["id"]
+        
+        # Concurrent embed calls are coalesced into one OpenAI request
+        embeddings = await asyncio.gather(*[
+            generate_preference_embedding(
+                f"{signal.signal_type}: {canonical_signal_data(signal.signal_data)}", None, openai
+            )
+            for signal in request.items
+        ])
+        
+        result = supabase.table("coding_signals").insert([
+            {
+                "user_id": user_id,
+                "signal_type": signal.signal_type,
+                "signal_data": signal.signal_data,
+                "embedding": embedding,
+                "confidence_score": signal.confidence_score
+            }
+            for signal, embedding in zip(request.items, embeddings)
+        ]).execute()
+        
+        if not result.data:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create coding signals"
+            )
+        
+        return {
+            "message": f"{len(result.data)} coding signals created successfully",
+            "ids": [row["id"] for row in result.data]
+        }
+        
+    except Exception as e:
+        logger.error("Failed to create coding signals", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create coding signals: {str(e)}"
+        )
+
+
 async def generate_preference_embedding(
     text: str, 
     context: Optional[str], 
@@ -368,12 +465,8 @@ async def generate_preference_embedding(
         if context:
             combined_text = f"{text}. Context: {context}"
         
-        response = await openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=combined_text
-        )
-        
-        return response.data[0].embedding
+        embedding = await get_embedding_service(openai_client).embed_text(combined_text)
+        return embedding.tolist()
         
     except Exception as e:
         logger.error("Failed to generate embedding", error=str(e))
@@ -23,7 +23,7 @@ router = APIRouter()
 async def create_fetch_history(request: CreateFetchHistoryRequest):
     """Create a new fetch history entry."""
     try:
-        supabase = await get_supabase_client()
+        supabase = get_supabase_client()
         
         data = {
             "endpoint": request.endpoint,
@@ -59,7 +59,7 @@ async def get_fetch_history(
 ):
     """Get fetch history with pagination and filters."""
     try:
-        supabase = await get_supabase_client()
+        supabase = get_supabase_client()
         
         # Build query
         query = supabase.table("fetch_history").select("*", count="exact")
@@ -113,7 +113,7 @@ async def get_fetch_history(
 async def delete_fetch_history(history_id: str):
     """Delete a fetch history entry."""
     try:
-        supabase = await get_supabase_client()
+        supabase = get_supabase_client()
         
         result = supabase.table("fetch_history").delete().eq("id", history_id).execute()
         
@@ -132,7 +132,7 @@ async def delete_fetch_history(history_id: str):
 async def clear_fetch_history():
     """Clear all fetch history entries."""
     try:
-        supabase = await get_supabase_client()
+        supabase = get_supabase_client()
         
         # Delete all entries
         result = supabase.table("fetch_history").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
@@ -149,10 +149,12 @@ async def clear_fetch_history():
 async def get_fetch_history_stats():
     """Get statistics about fetch history."""
     try:
-        supabase = await get_supabase_client()
+        supabase = get_supabase_client()
         
         # Get all history entries for stats
-        result = supabase.table("fetch_history").select("*").execute()
+        result = supabase.table("fetch_history").select(
+            "method, endpoint, status_code, duration_ms, error_message"
+        ).execute()
         
         total = len(result.data)
         
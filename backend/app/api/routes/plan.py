@@ -4,11 +4,13 @@ import os
 from typing import Optional
 from uuid import uuid4
 
+import orjson
 import structlog
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.models import PlanRequest, PlanResponse, ErrorResponse, PlanJSON
-from app.langgraph.graph import generate_plan
+from app.models import PlanRequest, PlanResponse, ErrorResponse, PlanEvent, PlanJSON
+from app.langgraph.graph import generate_plan, generate_plan_stream
 from app.supabase_client import create_plan, log_dev_event
 from app.local_storage import local_storage
 
@@ -97,7 +99,6 @@ async def create_development_plan(request: PlanRequest) -> PlanResponse:
         # If allowed, try to replace the template with a dynamically generated plan
         if PLAN_MODE != "mock":
             try:
-                import asyncio
                 logger.info("Attempting to generate dynamic plan", idea=idea)
                 
                 # Generate plan without timeout restrictions
@@ -185,6 +186,47 @@ async def create_development_plan(request: PlanRequest) -> PlanResponse:
         raise HTTPException(status_code=500, detail=detail)
 
 
+@router.post("/plan/stream")
+async def stream_development_plan(request: PlanRequest) -> StreamingResponse:
+    """Generate a development plan, streaming steps as NDJSON while the model writes them.
+
+    Emits ``{"type": "step", ...}`` lines as steps complete and a final
+    ``{"type": "plan", "planId": ...}`` line once the plan is saved.
+    """
+    idea = request.idea.strip()
+    if not idea:
+        raise HTTPException(status_code=400, detail="Idea must not be empty")
+
+    user_id = DEFAULT_USER_ID
+    logger.info("Streaming development plan", idea=idea, project_id=request.projectId)
+
+    async def events():
+        try:
+            async for event in generate_plan_stream(
+                idea=idea,
+                project_id=request.projectId,
+                user_id=user_id,
+            ):
+                if event.type == "plan":
+                    try:
+                        event.planId = await local_storage.create_plan(
+                            project_id=request.projectId,
+                            user_id=user_id,
+                            plan_json=event.data,
+                        )
+                    except Exception as storage_error:
+                        logger.error("Failed to save plan to local storage", error=str(storage_error))
+                        event.planId = str(uuid4())
+                yield orjson.dumps(event.model_dump()) + b"\n"
+        except Exception as e:
+            # Headers are already sent, so failures are reported in-band
+            logger.error("Streamed plan generation failed", error=str(e))
+            error = PlanEvent(type="error", data={"detail": f"Plan generation failed: {str(e)}"})
+            yield orjson.dumps(error.model_dump()) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("/plan/{plan_id}")
 async def get_plan(plan_id: str):
     """Get a specific plan by ID."""
@@ -1,12 +1,14 @@
 """LangGraph-inspired orchestration for plan generation."""
 
+import asyncio
 import re
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
 import structlog
 
-from app.openai_client import analyze_intent, gpt5_plan
+from app.models import PlanEvent
+from app.openai_client import analyze_intent, gpt5_plan, gpt5_plan_stream
 from app.supabase_client import get_style_profile, get_pattern
 
 logger = structlog.get_logger(__name__)
@@ -226,61 +228,71 @@ async def style_adaptation_node(state: PlanGenerationState) -> PlanGenerationSta
     return state
 
 
-async def generate_plan(idea: str, project_id: str, user_id: str) -> Dict[str, Any]:
-    """Generate a complete development plan with simplified sequential processing."""
-    try:
-        logger.info("Starting plan generation", idea=idea, project_id=project_id, user_id=user_id)
+async def _prepare_state(idea: str, project_id: str, user_id: str) -> PlanGenerationState:
+    """Build the pipeline state and load intent, style and pattern for the design step."""
+    state = PlanGenerationState(
+        idea=idea,
+        project_id=project_id,
+        user_id=user_id,
+    )
 
-        state = PlanGenerationState(
-            idea=idea,
-            project_id=project_id,
-            user_id=user_id,
-        )
-
-        # Set default values first to avoid dependency issues
-        state.intent = {"feature": "general", "route": "/api"}
-        state.pattern = {
-            "slug": "default",
-            "template": {
-                "steps": [
-                    {"kind": "code", "target": "main", "summary": "Implement core functionality"},
-                    {"kind": "test", "target": "tests", "summary": "Add tests"},
-                    {"kind": "config", "target": "config", "summary": "Update configuration"}
-                ],
-                "files": [],
-                "risks": ["Consider edge cases", "Test thoroughly"],
-                "tests": ["Unit tests", "Integration tests"],
-                "prBody": "Implementation of requested feature"
-            }
+    # Set default values first to avoid dependency issues
+    state.intent = {"feature": "general", "route": "/api"}
+    state.pattern = {
+        "slug": "default",
+        "template": {
+            "steps": [
+                {"kind": "code", "target": "main", "summary": "Implement core functionality"},
+                {"kind": "test", "target": "tests", "summary": "Add tests"},
+                {"kind": "config", "target": "config", "summary": "Update configuration"}
+            ],
+            "files": [],
+            "risks": ["Consider edge cases", "Test thoroughly"],
+            "tests": ["Unit tests", "Integration tests"],
+            "prBody": "Implementation of requested feature"
         }
-        state.style_profile = {
-            "tokens": {
-                "quotes": "double",
-                "semicolons": True,
-                "indent": "spaces",
-                "indent_size": 2,
-                "test_framework": "jest",
-                "directories": ["src", "tests"],
-                "aliases": {"@": "src"},
-                "language": "typescript"
-            }
+    }
+    state.style_profile = {
+        "tokens": {
+            "quotes": "double",
+            "semicolons": True,
+            "indent": "spaces",
+            "indent_size": 2,
+            "test_framework": "jest",
+            "directories": ["src", "tests"],
+            "aliases": {"@": "src"},
+            "language": "typescript"
         }
+    }
 
-        # Try to enhance with actual data, but don't fail if it doesn't work
-        try:
-            state = await intent_parser_node(state)
-        except Exception as e:
-            logger.warning("Intent parsing failed, using defaults", error=str(e))
-            
-        try:
-            state = await pattern_loader_node(state)
-        except Exception as e:
-            logger.warning("Pattern loading failed, using defaults", error=str(e))
-            
-        try:
-            state = await style_adapter_node(state)
-        except Exception as e:
-            logger.warning("Style loading failed, using defaults", error=str(e))
+    # Try to enhance with actual data, but don't fail if it doesn't work.
+    # Intent analysis and style loading are independent (they write
+    # different state fields), so their remote calls overlap.
+    intent_result, style_result = await asyncio.gather(
+        intent_parser_node(state),
+        style_adapter_node(state),
+        return_exceptions=True,
+    )
+    if isinstance(intent_result, Exception):
+        logger.warning("Intent parsing failed, using defaults", error=str(intent_result))
+    if isinstance(style_result, Exception):
+        logger.warning("Style loading failed, using defaults", error=str(style_result))
+
+    # The pattern is chosen from the parsed intent, so it runs afterwards
+    try:
+        state = await pattern_loader_node(state)
+    except Exception as e:
+        logger.warning("Pattern loading failed, using defaults", error=str(e))
+
+    return state
+
+
+async def generate_plan(idea: str, project_id: str, user_id: str) -> Dict[str, Any]:
+    """Generate a complete development plan, overlapping independent lookups."""
+    try:
+        logger.info("Starting plan generation", idea=idea, project_id=project_id, user_id=user_id)
+
+        state = await _prepare_state(idea, project_id, user_id)
 
         # Now run the design node with the collected data
         logger.info("Calling design node with LLM")
@@ -302,3 +314,27 @@ async def generate_plan(idea: str, project_id: str, user_id: str) -> Dict[str, A
     except Exception as e:
         logger.error("Plan generation workflow failed", error=str(e))
         raise
+
+
+async def generate_plan_stream(
+    idea: str, project_id: str, user_id: str
+) -> AsyncIterator[PlanEvent]:
+    """Generate a development plan, yielding steps as the model produces them."""
+    logger.info("Starting streamed plan generation", idea=idea, project_id=project_id, user_id=user_id)
+
+    state = await _prepare_state(idea, project_id, user_id)
+
+    async for event in gpt5_plan_stream(
+        idea=state.idea,
+        route=state.intent.get("route", "/api"),
+        pattern=state.pattern,
+        style=state.style_profile.get("tokens", {})
+    ):
+        if event.type == "plan":
+            # Style adaptation needs the full file list, so it runs on the final plan
+            state.plan_json = event.data
+            state = await style_adaptation_node(state)
+            if state.error:
+                raise ValueError(state.error)
+            event = PlanEvent(type="plan", data=state.plan_json)
+        yield event
@@ -17,6 +17,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.api.routes import ask, cursor_link, plan, plan_patch, coding_preferences, fetch_history
+from app.openai_client import close_openai, warm_openai
+from app.services.embedding_service import close_embedding_batchers
 from app.supabase_client import get_supabase_client
 from app.middleware import FetchTrackerMiddleware
 
@@ -30,14 +32,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     # Initialize Supabase client (best-effort in dev)
     try:
-        await get_supabase_client()
+        get_supabase_client()
     except Exception as e:
         # In local/dev environments, allow the app to run without Supabase
         logger.warning("Supabase client initialization skipped", error=str(e))
+
+    # Pre-warm the OpenAI connection so the first plan request skips the handshake
+    try:
+        await warm_openai()
+    except Exception as e:
+        logger.warning("OpenAI warm-up skipped", error=str(e))
     
     yield
     
     logger.info("Shutting down Blueprint Snap Backend")
+    # Batchers flush through the OpenAI client, so stop them before closing it
+    await close_embedding_batchers()
+    await close_openai()
 
 
 def create_app() -> FastAPI:
@@ -98,7 +98,7 @@ class FetchTrackerMiddleware(BaseHTTPMiddleware):
     ):
         """Log fetch to database."""
         try:
-            supabase = await get_supabase_client()
+            supabase = get_supabase_client()
             
             data = {
                 "endpoint": endpoint,
@@ -28,6 +28,13 @@ class PlanJSON(BaseModel):
     prBody: str = Field(..., description="Pull request body")
 
 
+class PlanEvent(BaseModel):
+    """Incremental event emitted while a plan is streamed."""
+    type: Literal["step", "plan", "error"] = Field(..., description="Event kind")
+    data: Dict[str, Any] = Field(default_factory=dict, description="Step, full plan, or error detail")
+    planId: Optional[str] = Field(None, description="Plan ID, set on the final plan event")
+
+
 class PlanRequest(BaseModel):
     """Request to create a new plan."""
     idea: str = Field(..., description="One-line idea description")
@@ -1,31 +1,161 @@
 """OpenAI client for GPT-5 integration."""
 
+import hashlib
 import json
 import os
 import re
-from typing import Any, Dict, List
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
+import httpx
+import orjson
 import structlog
-from openai import OpenAI
-from pydantic import BaseModel
-
-from app.models import PatchResponse, PlanJSON
+from openai import (
+    APIConnectionError,
+    APIError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError,
+)
+from pydantic import AliasChoices, BaseModel, Field, TypeAdapter, ValidationError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+from app.models import PatchResponse, PlanEvent, PlanFile, PlanJSON, PlanStep
 
 logger = structlog.get_logger(__name__)
 
 # OpenAI client will be initialized lazily
 client = None
 
+# Shared keep-alive pool so concurrent requests reuse one HTTP/2 connection
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# Transient failures worth retrying; anything else surfaces immediately
+_RETRYABLE_ERRORS = (APITimeoutError, APIConnectionError, RateLimitError, InternalServerError)
+
+# Upper bound on the serialized patch context sent to the model
+_CONTEXT_BUDGET_BYTES = 32_000
+_TRUNCATION_MARKER = "...[truncated]"
+
+# Leading language tag inside a ```json fence
+_JSON_TAG_RE = re.compile(r"^\s*json\s*\n", re.IGNORECASE)
+
+
+class _ParsedPlanStep(PlanStep):
+    """PlanStep that also accepts the alternate keys models tend to emit."""
+    target: str = Field(..., validation_alias=AliasChoices("target", "path"))
+    summary: str = Field(..., validation_alias=AliasChoices("summary", "description"))
+
+
+class _ParsedPlanFile(PlanFile):
+    """PlanFile that also accepts the alternate keys models tend to emit."""
+    path: str = Field(..., validation_alias=AliasChoices("path", "file"))
+
+
+class _ParsedPlan(PlanJSON):
+    """Parse-only PlanJSON for model output; the API request models stay strict."""
+    title: str = Field(..., validation_alias=AliasChoices("title", "name"))
+    steps: List[_ParsedPlanStep]
+    files: List[_ParsedPlanFile]
+    prBody: str = Field(..., validation_alias=AliasChoices("prBody", "pr_body"))
+
+
+# Validators are built once so each response reuses the compiled pydantic-core schema
+_PLAN_ADAPTER = TypeAdapter(PlanJSON)
+_PARSED_PLAN_ADAPTER = TypeAdapter(_ParsedPlan)
+_PATCH_ADAPTER = TypeAdapter(PatchResponse)
+
+
+class _ResponseCache:
+    """Small in-process TTL/LRU cache for model responses keyed by request hash."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Hash the canonical JSON form of the request inputs."""
+        body = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# Identical requests within the TTL skip the OpenAI round trip entirely
+_cache = _ResponseCache(
+    maxsize=int(os.getenv("OPENAI_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("OPENAI_CACHE_TTL", "3600")),
+)
+
+
+def _first_json_object(s: str) -> Optional[str]:
+    """Return the first balanced top-level {...} span in s, or None.
+
+    Braces inside JSON strings are ignored, so trailing prose or a second
+    object after the first one does not end up in the candidate.
+    """
+    start = s.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_str = False
+    esc = False
+    for i in range(start, len(s)):
+        c = s[i]
+        if in_str:
+            if esc:
+                esc = False
+            elif c == "\\":
+                esc = True
+            elif c == '"':
+                in_str = False
+        elif c == '"':
+            in_str = True
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return s[start : i + 1]
+    return None
+
 
 def _extract_json_object(text: str) -> Dict[str, Any]:
     """Best-effort JSON extractor for chat completions.
 
     - Strips code fences if present
-    - Extracts the first top-level JSON object if extra text wraps it
+    - Extracts the first complete top-level JSON object if extra text wraps it
     """
     if not text:
         raise ValueError("Empty response content")
 
+    # Fast path: response_format=json_object normally yields a bare JSON object
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+
     t = text.strip()
 
     # Remove code fences like ```json ... ``` or ``` ... ```
@@ -34,30 +164,102 @@ def _extract_json_object(text: str) -> Dict[str, Any]:
         parts = t.split("```")
         if len(parts) >= 3:
             # The middle part is the content; sometimes language tag present at start
-            inner = parts[1]
-            # Drop a leading language tag (e.g., json) on the same line
-            inner = re.sub(r"^\s*json\s*\n", "", inner, flags=re.IGNORECASE)
+            inner = parts[1].lstrip()
+            # Drop a leading language tag (e.g., json) on the same line;
+            # plain str checks cover the usual "json\n", the regex the rest
+            if inner[:4].lower() == "json":
+                if inner[4:5] in ("\n", "\r", " "):
+                    inner = inner[5:]
+                else:
+                    inner = _JSON_TAG_RE.sub("", inner)
             t = inner.strip()
 
-    # If it's already valid JSON
-    try:
-        return json.loads(t)
-    except Exception:
-        pass
+            # The fenced content is usually valid JSON on its own
+            try:
+                return orjson.loads(t)
+            except orjson.JSONDecodeError:
+                pass
 
-    # Try to locate the outermost JSON object
-    start = t.find("{")
-    end = t.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        candidate = t[start : end + 1]
+    # Try to locate the first complete top-level JSON object
+    candidate = _first_json_object(t)
+    if candidate is not None:
         try:
-            return json.loads(candidate)
-        except Exception:
+            return orjson.loads(candidate)
+        except orjson.JSONDecodeError:
             pass
 
     raise ValueError("Unable to parse JSON from model response")
 
 
+class _ArrayItemScanner:
+    """Incrementally scan streamed JSON text for completed items of top-level arrays.
+
+    Tracks bracket depth and string state across chunks, so each object in
+    e.g. ``{"steps": [{...}, {...}]}`` is yielded as soon as its closing
+    brace arrives, without re-parsing the whole buffer.
+    """
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = frozenset(keys)
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> Iterator[Tuple[str, str]]:
+        """Append a chunk and yield ``(key, item_json)`` for each completed item."""
+        self.text += chunk
+        text = self.text
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start + 1 : i]
+                continue
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c == ":" and self._depth == 1:
+                self._pending_key = self._last_string
+            elif c == "," and self._depth == 1:
+                self._pending_key = None
+            elif c in "{[":
+                if self._depth == 1 and c == "[" and self._pending_key in self.keys:
+                    self._array_key = self._pending_key
+                elif self._depth == 2 and self._array_key and c == "{":
+                    self._item_start = i
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._item_start is not None:
+                    yield self._array_key, text[self._item_start : i + 1]
+                    self._item_start = None
+                elif self._depth == 1 and c == "]":
+                    self._array_key = None
+        self._pos = len(text)
+
+
+def _extract_content(response: Any, label: str) -> str:
+    """Return the message content, falling back to the first tool call's arguments."""
+    msg = response.choices[0].message
+    content = msg.content or (msg.tool_calls[0].function.arguments if msg.tool_calls else "")
+    if not content:
+        raise ValueError(f"Model returned empty response content for {label}")
+    return content
+
+
 def get_model() -> str:
     """Return the model to use.
 
@@ -73,10 +275,79 @@ def get_openai_client():
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
-        client = OpenAI(api_key=api_key)
+        # Retries are handled by _create_completion, so the SDK's own loop is off
+        client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=0,
+            http_client=httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS),
+        )
     return client
 
 
+async def warm_openai() -> None:
+    """Open the pooled connection to OpenAI so the first request skips TLS setup."""
+    warm_client = get_openai_client().with_options(timeout=10)
+    await warm_client.models.list()
+    logger.info("OpenAI connection warmed")
+
+
+async def close_openai() -> None:
+    """Close the pooled OpenAI connection, if one was opened."""
+    global client
+    if client is not None:
+        await client.close()
+        client = None
+
+
+@retry(
+    retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=1, max=8),
+    reraise=True,
+)
+async def _create_completion(**kwargs: Any) -> Any:
+    """Create a chat completion, retrying transient failures with jittered backoff."""
+    return await get_openai_client().chat.completions.create(**kwargs)
+
+
+def _truncate_context(context: Dict[str, Any], max_bytes: int = _CONTEXT_BUDGET_BYTES) -> Dict[str, Any]:
+    """Shrink the largest string fields until the serialized context fits max_bytes.
+
+    Returns the context unchanged when it already fits; otherwise a truncated copy.
+    """
+    size = len(orjson.dumps(context))
+    if size <= max_bytes:
+        return context
+
+    trimmed = orjson.loads(orjson.dumps(context))
+    leaves: List[Tuple[Any, Any]] = []
+
+    def _collect(node: Any) -> None:
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            if isinstance(value, str):
+                leaves.append((node, key))
+            elif isinstance(value, (dict, list)):
+                _collect(value)
+
+    _collect(trimmed)
+    leaves.sort(key=lambda leaf: len(leaf[0][leaf[1]].encode()), reverse=True)
+
+    for container, key in leaves:
+        if size <= max_bytes:
+            break
+        value = container[key]
+        # The budget is in UTF-8 bytes, so cut the encoded value, not characters
+        encoded = value.encode()
+        keep = max(0, len(encoded) - (size - max_bytes) - len(_TRUNCATION_MARKER))
+        shortened = encoded[:keep].decode(errors="ignore") + _TRUNCATION_MARKER
+        size -= len(orjson.dumps(value)) - len(orjson.dumps(shortened))
+        container[key] = shortened
+
+    logger.info("Truncated patch context", original_bytes=len(orjson.dumps(context)), bytes=size)
+    return trimmed
+
+
 class PlanOut(BaseModel):
     """Output model for plan generation."""
     title: str
@@ -93,6 +364,130 @@ class PatchOut(BaseModel):
     patch: List[Dict[str, Any]]  # RFC6902
 
 
+def _normalize_plan(raw: Dict[str, Any], idea: str, pattern: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce a model's plan output into the PlanJSON shape, filling sparse fields."""
+    # Normalize possible variants to the expected PlanJSON shape
+    def _get(obj: Dict[str, Any], *candidates: str, default=None):
+        for key in candidates:
+            if key in obj and obj[key] is not None:
+                return obj[key]
+        return default
+
+    root = raw.get("plan") if isinstance(raw, dict) and isinstance(raw.get("plan"), dict) else raw
+    if not isinstance(root, dict):
+        raise ValueError("Plan payload is not a JSON object")
+
+    title = _get(root, "title", "name", default=f"Development Plan: {idea}")
+    steps = _get(root, "steps", default=[])
+    files = _get(root, "files", default=[])
+    risks = _get(root, "risks", default=[])
+    tests = _get(root, "tests", default=[])
+    pr_body = _get(root, "prBody", "pr_body", default=f"## Development Plan: {idea}")
+
+    # Coerce lists
+    if not isinstance(steps, list):
+        steps = []
+    if not isinstance(files, list):
+        files = []
+    if not isinstance(risks, list):
+        risks = []
+    if not isinstance(tests, list):
+        tests = []
+
+    # Minimal step coercion
+    def _coerce_step(s: Any) -> Dict[str, Any]:
+        if not isinstance(s, dict):
+            return {"kind": "code", "target": "src/main", "summary": str(s)}
+        kind = s.get("kind") or "code"
+        target = s.get("target") or s.get("path") or "src/main"
+        summary = s.get("summary") or s.get("description") or "Implement step"
+        return {"kind": kind, "target": target, "summary": summary}
+
+    steps = [_coerce_step(s) for s in steps]
+
+    # Minimal file coercion
+    def _coerce_file(f: Any) -> Dict[str, Any]:
+        if not isinstance(f, dict):
+            return {"path": "README.md", "content": str(f)}
+        path = f.get("path") or f.get("file") or "README.md"
+        content_val = f.get("content")
+        if content_val is None:
+            # some models wrap as {content: {language, code}}
+            body = f.get("body") or f.get("code")
+            content_val = body if isinstance(body, str) else json.dumps(body) if body is not None else ""
+        return {"path": path, "content": content_val}
+
+    files = [_coerce_file(f) for f in files]
+
+    plan_data = {
+        "title": title,
+        "steps": steps,
+        "files": files,
+        "risks": risks,
+        "tests": tests,
+        "prBody": pr_body,
+    }
+
+    # Apply safe fallbacks if the model returned sparse content
+    try:
+        tmpl = pattern.get("template", {}) if isinstance(pattern, dict) else {}
+        if not plan_data["steps"]:
+            plan_data["steps"] = tmpl.get("steps", []) or [
+                {"kind": "code", "target": "main", "summary": "Implement core functionality"},
+                {"kind": "test", "target": "tests", "summary": "Add tests"},
+                {"kind": "config", "target": "config", "summary": "Update configuration"},
+            ]
+        if not plan_data["files"]:
+            default_readme = f"# {title}\n\nThis project implements: {idea}\n\n## Notes\n- Generated with default fallbacks."
+            plan_data["files"] = tmpl.get("files", []) or [
+                {"path": "README.md", "content": default_readme}
+            ]
+        if not plan_data["risks"]:
+            plan_data["risks"] = tmpl.get("risks", []) or [
+                "Consider edge cases",
+                "Test thoroughly",
+            ]
+        if not plan_data["tests"]:
+            plan_data["tests"] = tmpl.get("tests", []) or [
+                "Unit tests",
+                "Integration tests",
+            ]
+        if not plan_data["prBody"]:
+            plan_data["prBody"] = tmpl.get("prBody", f"## Development Plan: {idea}")
+    except Exception:
+        # Non-fatal; keep whatever we have
+        pass
+
+    return plan_data
+
+
+def _parse_plan(content: str, idea: str, pattern: Dict[str, Any]) -> PlanJSON:
+    """Parse model output into a PlanJSON.
+
+    Well-formed responses are parsed and validated in one pydantic-core pass;
+    anything else (fences, wrappers, loose shapes, sparse fields) goes through
+    _extract_json_object and _normalize_plan.
+    """
+    try:
+        parsed = _PARSED_PLAN_ADAPTER.validate_json(content)
+    except ValidationError:
+        pass
+    else:
+        if parsed.steps and parsed.files and parsed.risks and parsed.tests and parsed.prBody:
+            # Already validated; rebuild as the public models without a second pass
+            return PlanJSON.model_construct(
+                title=parsed.title,
+                steps=[PlanStep.model_construct(**dict(step)) for step in parsed.steps],
+                files=[PlanFile.model_construct(**dict(f)) for f in parsed.files],
+                risks=parsed.risks,
+                tests=parsed.tests,
+                prBody=parsed.prBody,
+            )
+
+    raw = _extract_json_object(content)
+    return _PLAN_ADAPTER.validate_python(_normalize_plan(raw, idea, pattern))
+
+
 async def gpt5_plan(
     idea: str, 
     route: str, 
@@ -100,252 +495,232 @@ async def gpt5_plan(
     style: Dict[str, Any]
 ) -> PlanJSON:
     """Generate a development plan using GPT-5."""
+    system_prompt = (
+        "You are an expert software architect and developer. "
+        "You produce deterministic, production-safe development plans. "
+        "Return ONLY valid JSON matching the provided schema. "
+        "Be specific about implementation details, consider edge cases, "
+        "and provide comprehensive test scenarios."
+    )
+    
+    user_content = {
+        "idea": idea,
+        "route": route,
+        "patternTemplate": pattern.get("template", {}),
+        "styleTokens": style
+    }
+    
+    model_name = get_model()
+    log = logger.bind(fn="gpt5_plan", model=model_name)
+    cache_key = _cache.key("plan", model_name, user_content)
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        log.info("Plan served from cache")
+        return cached.model_copy(deep=True)
+
+    log.info("Calling OpenAI for plan")
+    # Prefer JSON response formatting for reliable parsing
+    use_resp_format = True
+    kwargs = {
+        "model": model_name,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": json.dumps(user_content)}
+        ],
+        "timeout": 120,  # Increase timeout to 2 minutes
+    }
+    if use_resp_format:
+        kwargs["response_format"] = {"type": "json_object"}
     try:
-        system_prompt = (
-            "You are an expert software architect and developer. "
-            "You produce deterministic, production-safe development plans. "
-            "Return ONLY valid JSON matching the provided schema. "
-            "Be specific about implementation details, consider edge cases, "
-            "and provide comprehensive test scenarios."
-        )
-        
-        user_content = {
-            "idea": idea,
-            "route": route,
-            "patternTemplate": pattern.get("template", {}),
-            "styleTokens": style
-        }
-        
-        tool_schema = PlanOut.model_json_schema()
-        
-        model_name = get_model()
-        logger.info("Calling OpenAI for plan", model=model_name)
-        # Prefer JSON response formatting for reliable parsing
-        use_resp_format = True
-        kwargs = {
-            "model": model_name,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(user_content)}
-            ],
-            "timeout": 120,  # Increase timeout to 2 minutes
-        }
-        if use_resp_format:
-            kwargs["response_format"] = {"type": "json_object"}
-        response = get_openai_client().chat.completions.create(**kwargs)
-
-        # Extract plan JSON from content or tool call args
-        msg = response.choices[0].message
-        content = getattr(msg, "content", None)
-        if not content:
-            tool_calls = getattr(msg, "tool_calls", None)
-            if tool_calls:
+        response = await _create_completion(**kwargs)
+    except APIError as e:
+        log.error("OpenAI request failed for plan", error=str(e))
+        raise
+
+    # Extract plan JSON from content or tool call args
+    try:
+        content = _extract_content(response, "plan")
+        plan = _parse_plan(content, idea, pattern)
+    except ValueError as e:
+        log.error("Failed to parse plan from model response", error=str(e))
+        raise
+
+    _cache.set(cache_key, plan.model_copy(deep=True))
+    return plan
+
+
+async def gpt5_plan_stream(
+    idea: str,
+    route: str,
+    pattern: Dict[str, Any],
+    style: Dict[str, Any]
+) -> AsyncIterator[PlanEvent]:
+    """Stream a development plan, yielding each step as soon as it is complete.
+
+    The final event carries the full validated plan, exactly as gpt5_plan
+    would return it.
+    """
+    system_prompt = (
+        "You are an expert software architect and developer. "
+        "You produce deterministic, production-safe development plans. "
+        "Return ONLY valid JSON matching the provided schema, with the keys in "
+        "the order title, steps, files, risks, tests, prBody. "
+        "Be specific about implementation details, consider edge cases, "
+        "and provide comprehensive test scenarios."
+    )
+
+    user_content = {
+        "idea": idea,
+        "route": route,
+        "patternTemplate": pattern.get("template", {}),
+        "styleTokens": style
+    }
+
+    model_name = get_model()
+    log = logger.bind(fn="gpt5_plan_stream", model=model_name)
+    cache_key = _cache.key("plan", model_name, user_content)
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        log.info("Plan served from cache")
+        for step in cached.steps:
+            yield PlanEvent(type="step", data=step.model_dump())
+        yield PlanEvent(type="plan", data=cached.model_dump())
+        return
+
+    log.info("Streaming plan from OpenAI")
+    kwargs = {
+        "model": model_name,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": json.dumps(user_content)}
+        ],
+        "response_format": {"type": "json_object"},
+        "timeout": 120,
+        "stream": True,
+    }
+    scanner = _ArrayItemScanner(("steps",))
+    try:
+        stream = await _create_completion(**kwargs)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            for _, item in scanner.feed(delta):
                 try:
-                    content = tool_calls[0].function.arguments
-                    logger.info("Parsed plan from tool call arguments")
-                except Exception:
-                    content = None
-        if not content:
-            raise ValueError("Model returned empty response content for plan")
-        raw = _extract_json_object(content)
-
-        # Normalize possible variants to the expected PlanJSON shape
-        def _get(obj: Dict[str, Any], *candidates: str, default=None):
-            for key in candidates:
-                if key in obj and obj[key] is not None:
-                    return obj[key]
-            return default
-
-        root = raw.get("plan") if isinstance(raw, dict) and isinstance(raw.get("plan"), dict) else raw
-        if not isinstance(root, dict):
-            raise ValueError("Plan payload is not a JSON object")
-
-        title = _get(root, "title", "name", default=f"Development Plan: {idea}")
-        steps = _get(root, "steps", default=[])
-        files = _get(root, "files", default=[])
-        risks = _get(root, "risks", default=[])
-        tests = _get(root, "tests", default=[])
-        pr_body = _get(root, "prBody", "pr_body", default=f"## Development Plan: {idea}")
-
-        # Coerce lists
-        if not isinstance(steps, list):
-            steps = []
-        if not isinstance(files, list):
-            files = []
-        if not isinstance(risks, list):
-            risks = []
-        if not isinstance(tests, list):
-            tests = []
-
-        # Minimal step coercion
-        def _coerce_step(s: Any) -> Dict[str, Any]:
-            if not isinstance(s, dict):
-                return {"kind": "code", "target": "src/main", "summary": str(s)}
-            kind = s.get("kind") or "code"
-            target = s.get("target") or s.get("path") or "src/main"
-            summary = s.get("summary") or s.get("description") or "Implement step"
-            return {"kind": kind, "target": target, "summary": summary}
-
-        steps = [_coerce_step(s) for s in steps]
-
-        # Minimal file coercion
-        def _coerce_file(f: Any) -> Dict[str, Any]:
-            if not isinstance(f, dict):
-                return {"path": "README.md", "content": str(f)}
-            path = f.get("path") or f.get("file") or "README.md"
-            content_val = f.get("content")
-            if content_val is None:
-                # some models wrap as {content: {language, code}}
-                body = f.get("body") or f.get("code")
-                content_val = body if isinstance(body, str) else json.dumps(body) if body is not None else ""
-            return {"path": path, "content": content_val}
-
-        files = [_coerce_file(f) for f in files]
-
-        plan_data = {
-            "title": title,
-            "steps": steps,
-            "files": files,
-            "risks": risks,
-            "tests": tests,
-            "prBody": pr_body,
-        }
-
-        # Apply safe fallbacks if the model returned sparse content
-        try:
-            tmpl = pattern.get("template", {}) if isinstance(pattern, dict) else {}
-            if not plan_data["steps"]:
-                plan_data["steps"] = tmpl.get("steps", []) or [
-                    {"kind": "code", "target": "main", "summary": "Implement core functionality"},
-                    {"kind": "test", "target": "tests", "summary": "Add tests"},
-                    {"kind": "config", "target": "config", "summary": "Update configuration"},
-                ]
-            if not plan_data["files"]:
-                default_readme = f"# {title}\n\nThis project implements: {idea}\n\n## Notes\n- Generated with default fallbacks."
-                plan_data["files"] = tmpl.get("files", []) or [
-                    {"path": "README.md", "content": default_readme}
-                ]
-            if not plan_data["risks"]:
-                plan_data["risks"] = tmpl.get("risks", []) or [
-                    "Consider edge cases",
-                    "Test thoroughly",
-                ]
-            if not plan_data["tests"]:
-                plan_data["tests"] = tmpl.get("tests", []) or [
-                    "Unit tests",
-                    "Integration tests",
-                ]
-            if not plan_data["prBody"]:
-                plan_data["prBody"] = tmpl.get("prBody", f"## Development Plan: {idea}")
-        except Exception:
-            # Non-fatal; keep whatever we have
-            pass
-        
-        # Convert to our PlanJSON model
-        return PlanJSON(
-            title=plan_data["title"],
-            steps=plan_data["steps"],
-            files=plan_data["files"],
-            risks=plan_data["risks"],
-            tests=plan_data["tests"],
-            prBody=plan_data["prBody"],
-        )
-        
-    except Exception as e:
-        logger.error("Failed to generate plan with GPT-5", error=str(e))
+                    yield PlanEvent(type="step", data=orjson.loads(item))
+                except orjson.JSONDecodeError:
+                    # The final parse below still sees the whole response
+                    continue
+    except APIError as e:
+        log.error("OpenAI request failed for plan stream", error=str(e))
         raise
 
+    try:
+        plan = _parse_plan(scanner.text, idea, pattern)
+    except ValueError as e:
+        log.error("Failed to parse streamed plan", error=str(e))
+        raise
+
+    _cache.set(cache_key, plan.model_copy(deep=True))
+    yield PlanEvent(type="plan", data=plan.model_dump())
+
 
 async def gpt5_patch(context: Dict[str, Any]) -> PatchResponse:
     """Generate a JSON patch using GPT-5."""
+    system_prompt = (
+        "You are an expert code reviewer and developer. "
+        "You propose MINIMAL JSON Patch edits to the given nodePath only. "
+        "Return JSON with 'rationale' and 'patch' fields. "
+        "Maximum 10 operations, 10KB total. "
+        "Focus on the specific area requested by the user."
+    )
+    
+    context = _truncate_context(context)
+    model_name = get_model()
+    log = logger.bind(fn="gpt5_patch", model=model_name)
+    cache_key = _cache.key("patch", model_name, context)
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        log.info("Patch served from cache")
+        return cached.model_copy(deep=True)
+
+    log.info("Calling OpenAI for patch")
+    use_resp_format = True
+    kwargs = {
+        "model": model_name,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": json.dumps(context)}
+        ],
+    }
+    if use_resp_format:
+        kwargs["response_format"] = {"type": "json_object"}
     try:
-        system_prompt = (
-            "You are an expert code reviewer and developer. "
-            "You propose MINIMAL JSON Patch edits to the given nodePath only. "
-            "Return JSON with 'rationale' and 'patch' fields. "
-            "Maximum 10 operations, 10KB total. "
-            "Focus on the specific area requested by the user."
-        )
-        
-        model_name = get_model()
-        logger.info("Calling OpenAI for patch", model=model_name)
-        use_resp_format = True
-        kwargs = {
-            "model": model_name,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(context)}
-            ],
-        }
-        if use_resp_format:
-            kwargs["response_format"] = {"type": "json_object"}
-        response = get_openai_client().chat.completions.create(**kwargs)
-
-        # Extract the patch data from the response (content or tool call args)
-        msg = response.choices[0].message
-        content = getattr(msg, "content", None)
-        if not content:
-            tool_calls = getattr(msg, "tool_calls", None)
-            if tool_calls:
-                try:
-                    content = tool_calls[0].function.arguments
-                    logger.info("Parsed patch from tool call arguments")
-                except Exception:
-                    content = None
-        if not content:
-            raise ValueError("Model returned empty response content for patch")
+        response = await _create_completion(**kwargs)
+    except APIError as e:
+        log.error("OpenAI request failed for patch", error=str(e))
+        raise
+
+    # Extract the patch data from the response (content or tool call args)
+    try:
+        content = _extract_content(response, "patch")
         patch_data = _extract_json_object(content)
-        
-        return PatchResponse(
-            rationale=patch_data["rationale"],
-            patch=patch_data["patch"]
-        )
-        
-    except Exception as e:
-        logger.error("Failed to generate patch with GPT-5", error=str(e))
+    except ValueError as e:
+        log.error("Failed to parse patch from model response", error=str(e))
         raise
+    
+    patch = _PATCH_ADAPTER.validate_python(patch_data)
+    _cache.set(cache_key, patch.model_copy(deep=True))
+    return patch
 
 
 async def analyze_intent(idea: str) -> Dict[str, str]:
     """Analyze user intent to extract feature and route information."""
+    system_prompt = (
+        "You are an expert at analyzing software development requests. "
+        "Extract the main feature and target route from the user's idea. "
+        "Return JSON with 'feature' and 'route' fields. "
+        "Be specific about the route path (e.g., '/users', '/api/products')."
+    )
+    
+    model_name = get_model()
+    log = logger.bind(fn="analyze_intent", model=model_name)
+    cache_key = _cache.key("intent", model_name, idea)
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        log.info("Intent served from cache")
+        return dict(cached)
+
+    log.info("Calling OpenAI for intent")
+    use_resp_format = True
+    kwargs = {
+        "model": model_name,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Analyze this idea: {idea}"}
+        ],
+        "timeout": 60,  # Increase timeout to 1 minute for intent analysis
+    }
+    if use_resp_format:
+        kwargs["response_format"] = {"type": "json_object"}
+    # Intent is best-effort: one attempt without the retry policy, falling
+    # back to default values on any failure instead of stalling the request
     try:
-        system_prompt = (
-            "You are an expert at analyzing software development requests. "
-            "Extract the main feature and target route from the user's idea. "
-            "Return JSON with 'feature' and 'route' fields. "
-            "Be specific about the route path (e.g., '/users', '/api/products')."
-        )
-        
-        model_name = get_model()
-        logger.info("Calling OpenAI for intent", model=model_name)
-        use_resp_format = True
-        kwargs = {
-            "model": model_name,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Analyze this idea: {idea}"}
-            ],
-            "timeout": 60,  # Increase timeout to 1 minute for intent analysis
-        }
-        if use_resp_format:
-            kwargs["response_format"] = {"type": "json_object"}
-        response = get_openai_client().chat.completions.create(**kwargs)
-
-        msg = response.choices[0].message
-        content = getattr(msg, "content", None)
-        if not content:
-            tool_calls = getattr(msg, "tool_calls", None)
-            if tool_calls:
-                try:
-                    content = tool_calls[0].function.arguments
-                    logger.info("Parsed intent from tool call arguments")
-                except Exception:
-                    content = None
-        if not content:
-            raise ValueError("Model returned empty response content for intent")
-        return _extract_json_object(content)
-        
-    except Exception as e:
-        logger.error("Failed to analyze intent", error=str(e))
-        # Fallback to default values
+        response = await get_openai_client().chat.completions.create(**kwargs)
+    except (APIError, ValueError) as e:
+        log.error("OpenAI request failed for intent", error=str(e))
         return {"feature": "general", "route": "/api"}
+
+    try:
+        content = _extract_content(response, "intent")
+        intent = _extract_json_object(content)
+    except ValueError as e:
+        log.error("Failed to parse intent from model response", error=str(e))
+        return {"feature": "general", "route": "/api"}
+
+    # Only successful analyses are cached; fallbacks are retried next time
+    _cache.set(cache_key, dict(intent))
+    return intent
+
@@ -1,11 +1,14 @@
 """Security utilities for HMAC signing and verification."""
 
 import base64
+import functools
 import hashlib
 import hmac
+import json
 import os
 from typing import Dict, Any
 
+import orjson
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -19,21 +22,46 @@ def get_hmac_secret() -> str:
     return secret
 
 
+@functools.lru_cache(maxsize=1)
+def _hmac_template() -> "hmac.HMAC":
+    """Return an HMAC-SHA256 keyed with the secret; copy it per message.
+
+    Call ``_hmac_template.cache_clear()`` after rotating HMAC_SECRET.
+    """
+    return hmac.new(get_hmac_secret().encode('utf-8'), digestmod=hashlib.sha256)
+
+
+def _canonical(payload: Dict[str, Any]) -> bytes:
+    """Serialize a payload to its canonical (sorted, compact) JSON bytes.
+
+    Non-ASCII characters stay \\u-escaped, as json.dumps has always produced,
+    so signatures issued before stay valid; orjson would emit raw UTF-8.
+    """
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('ascii')
+
+
+def _mac(body: bytes) -> bytes:
+    """Return the raw HMAC-SHA256 digest of body."""
+    mac = _hmac_template().copy()
+    mac.update(body)
+    return mac.digest()
+
+
+def _b64url(raw: bytes) -> str:
+    """Encode bytes as unpadded base64url text."""
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _payload_signature(payload: Dict[str, Any]) -> str:
+    """Return the unpadded base64url signature of a payload."""
+    return _b64url(_mac(_canonical(payload)))
+
+
 def sign_payload(payload: Dict[str, Any]) -> str:
     """Sign a payload with HMAC-SHA256."""
     try:
-        import json
-        
-        secret = get_hmac_secret()
-        payload_json = json.dumps(payload, sort_keys=True, separators=(',', ':'))
-        signature = hmac.new(
-            secret.encode('utf-8'),
-            payload_json.encode('utf-8'),
-            hashlib.sha256
-        ).digest()
-        
         # Return base64url encoded signature
-        return base64.urlsafe_b64encode(signature).decode('utf-8').rstrip('=')
+        return _payload_signature(payload)
         
     except Exception as e:
         logger.error("Failed to sign payload", error=str(e))
@@ -43,27 +71,36 @@ def sign_payload(payload: Dict[str, Any]) -> str:
 def verify_signature(payload: Dict[str, Any], signature: str) -> bool:
     """Verify HMAC signature of a payload."""
     try:
-        expected_signature = sign_payload(payload)
-        return hmac.compare_digest(signature, expected_signature)
+        expected_signature = _payload_signature(payload)
+        return hmac.compare_digest(signature.rstrip('='), expected_signature)
         
     except Exception as e:
         logger.error("Failed to verify signature", error=str(e))
         return False
 
 
+def sign_payload_raw(body_b64: str) -> str:
+    """Sign an already base64url-encoded payload body with HMAC-SHA256.
+
+    The signature covers the exact bytes placed in the link, so verifiers
+    never have to re-serialize the JSON before checking it.
+    """
+    try:
+        return _b64url(_mac(body_b64.encode('ascii')))
+        
+    except Exception as e:
+        logger.error("Failed to sign payload", error=str(e))
+        raise
+
+
 def create_cursor_link(payload: Dict[str, Any]) -> str:
     """Create a Cursor deep link with signed payload."""
     try:
-        import json
-        
         # Convert payload to JSON and encode as base64url
-        payload_json = json.dumps(payload)
-        payload_b64 = base64.urlsafe_b64encode(
-            payload_json.encode('utf-8')
-        ).decode('utf-8').rstrip('=')
+        payload_b64 = _b64url(orjson.dumps(payload))
         
-        # Sign the payload
-        signature = sign_payload(payload)
+        # Sign the encoded body exactly as it appears in the link
+        signature = sign_payload_raw(payload_b64)
         
         # Create the deep link
         link = f"vscode://subhrato.blueprint-snap/ingest?data={payload_b64}&sig={signature}"
@@ -78,34 +115,15 @@ def create_cursor_link(payload: Dict[str, Any]) -> str:
 def decode_cursor_payload(data: str, signature: str) -> Dict[str, Any]:
     """Decode and verify a Cursor payload."""
     try:
-        import json
-        
-        # Add padding if needed
-        missing_padding = len(data) % 4
-        if missing_padding:
-            data += '=' * (4 - missing_padding)
-        
-        # Decode base64url
-        payload_json = base64.urlsafe_b64decode(data).decode('utf-8')
-        payload = json.loads(payload_json)
-        
-        # Verify signature using the same JSON format as signing
-        secret = get_hmac_secret()
-        normalized_json = json.dumps(payload, sort_keys=True, separators=(',', ':'))
-        expected_signature = hmac.new(
-            secret.encode('utf-8'),
-            normalized_json.encode('utf-8'),
-            hashlib.sha256
-        ).digest()
-        expected_sig_b64 = base64.urlsafe_b64encode(expected_signature).decode('utf-8').rstrip('=')
-        
-        # Add padding to signature if needed
-        sig_padded = signature + '=' * ((4 - len(signature) % 4) % 4)
-        expected_padded = expected_sig_b64 + '=' * ((4 - len(expected_sig_b64) % 4) % 4)
-        
-        if not hmac.compare_digest(sig_padded, expected_padded):
+        # Verify the signature over the received bytes before touching the JSON
+        data = data.rstrip('=')
+        expected_signature = sign_payload_raw(data)
+        if not hmac.compare_digest(signature.rstrip('='), expected_signature):
             raise ValueError("Invalid signature")
         
+        # Restore padding and decode base64url
+        payload = orjson.loads(base64.urlsafe_b64decode(data + '=' * (-len(data) & 3)))
+        
         return payload
         
     except Exception as e:
@@ -1,25 +1,213 @@
 """Service for generating and managing embeddings for coding preferences and patterns."""
 
-import json
-from typing import List, Dict, Any, Optional
+import asyncio
+import functools
+import hashlib
+import weakref
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import orjson
 import structlog
+import tiktoken
 from openai import AsyncOpenAI
 
 logger = structlog.get_logger(__name__)
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# text-embedding-3-small accepts 8191 tokens; code content gets a smaller share
+EMBED_MAX_TOKENS = 8000
+CODE_CONTENT_MAX_TOKENS = 7500
+
+# Bounded LRU of embeddings keyed by SHA-256 of the exact input text
+EMBED_CACHE_SIZE = 4096
+_embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+# Coalescing window for concurrent single-text embedding requests
+EMBED_BATCH_MAX_SIZE = 128
+EMBED_BATCH_MAX_WAIT = 0.02
+
+
+class _EmbedBatcher:
+    """Coalesce concurrent single-text embedding calls into batched requests.
+
+    Callers await a future; a background task drains the queue for up to
+    EMBED_BATCH_MAX_WAIT seconds (or EMBED_BATCH_MAX_SIZE items) and sends
+    one embeddings.create(input=[...]) call per batch.
+    """
+    
+    def __init__(self, openai_client: AsyncOpenAI):
+        self._client_ref = weakref.ref(openai_client)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flushes: set = set()
+    
+    async def embed(self, text: str) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        batch: List[Tuple[str, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + EMBED_BATCH_MAX_WAIT
+                while len(batch) < EMBED_BATCH_MAX_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                # Flush without blocking collection of the next batch
+                task = loop.create_task(self._flush(batch))
+                self._flushes.add(task)
+                task.add_done_callback(self._flushes.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Calls already taken off the queue would otherwise wait forever
+            error = RuntimeError("Embedding batcher was closed")
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+    
+    async def close(self) -> None:
+        """Stop the collector task, let in-flight batches finish and fail queued calls."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher was closed"))
+    
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            client = self._client_ref()
+            if client is None:
+                raise RuntimeError("OpenAI client was closed")
+            response = await client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[text for text, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for item in response.data:
+            future = batch[item.index][1]
+            if not future.done():
+                future.set_result(_to_vector(item.embedding))
+
+
+def _to_vector(values: List[float]) -> np.ndarray:
+    """Pack an embedding into a read-only float32 array."""
+    vector = np.asarray(values, dtype=np.float32)
+    # Vectors are shared through the cache, so callers must not mutate them
+    vector.setflags(write=False)
+    return vector
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> "tiktoken.Encoding":
+    """Return the tokenizer used by the embedding model (built once)."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _truncate_tokens(text: str, max_tokens: int = EMBED_MAX_TOKENS) -> str:
+    """Cut text to at most max_tokens tokens without splitting characters."""
+    # Byte-level BPE never yields more tokens than UTF-8 bytes
+    if len(text.encode("utf-8")) <= max_tokens:
+        return text
+    tokens = _encoding().encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    # A cut inside a multi-byte character decodes to a trailing U+FFFD
+    return _encoding().decode(tokens[:max_tokens]).rstrip("\ufffd")
+
+
+def canonical_signal_data(signal_data: Dict[str, Any]) -> str:
+    """Serialize signal data to compact, key-sorted JSON.
+
+    Equal payloads always produce the same text, and so hit the same
+    embedding cache entry regardless of dict ordering.
+    """
+    return orjson.dumps(signal_data, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+
+
+# One batcher per client, so calls from per-request service instances coalesce
+_batchers: "weakref.WeakKeyDictionary[AsyncOpenAI, _EmbedBatcher]" = weakref.WeakKeyDictionary()
+
+
+def _get_batcher(openai_client: AsyncOpenAI) -> _EmbedBatcher:
+    batcher = _batchers.get(openai_client)
+    if batcher is None:
+        batcher = _batchers[openai_client] = _EmbedBatcher(openai_client)
+    return batcher
+
+
+async def close_embedding_batchers() -> None:
+    """Stop every batcher's background task; called on application shutdown."""
+    for batcher in list(_batchers.values()):
+        await batcher.close()
+
 
 class EmbeddingService:
     """Service for generating embeddings for coding preferences and patterns."""
     
     def __init__(self, openai_client: AsyncOpenAI):
         self.openai_client = openai_client
+        self._batcher = _get_batcher(openai_client)
+    
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Embed a single piece of text with the shared embedding model.
+        
+        Returns a read-only float32 vector; call ``.tolist()`` at the database
+        boundary. Repeated texts are served from an in-process LRU; concurrent
+        misses are coalesced into a single batched request. Text longer than
+        EMBED_MAX_TOKENS is truncated to fit the model.
+        """
+        text = _truncate_tokens(text)
+        key = hashlib.sha256(text.encode("utf-8")).digest()
+        cached = _embedding_cache.get(key)
+        if cached is not None:
+            _embedding_cache.move_to_end(key)
+            return cached
+        
+        embedding = await self._batcher.embed(text)
+        _embedding_cache[key] = embedding
+        if len(_embedding_cache) > EMBED_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+        return embedding
     
     async def generate_preference_embedding(
         self, 
         preference_text: str, 
         context: Optional[str] = None,
         category: Optional[str] = None
-    ) -> List[float]:
+    ) -> np.ndarray:
         """Generate an embedding for a coding preference."""
         try:
             # Create a comprehensive text for embedding
@@ -34,12 +222,7 @@ class EmbeddingService:
             # Add some structure to help with semantic understanding
             structured_text = f"Coding preference: {combined_text}"
             
-            response = await self.openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=structured_text
-            )
-            
-            return response.data[0].embedding
+            return await self.embed_text(structured_text)
             
         except Exception as e:
             logger.error("Failed to generate preference embedding", error=str(e))
@@ -49,18 +232,13 @@ class EmbeddingService:
         self, 
         signal_type: str, 
         signal_data: Dict[str, Any]
-    ) -> List[float]:
+    ) -> np.ndarray:
         """Generate an embedding for a coding signal (behavioral data)."""
         try:
             # Create a structured representation of the signal
-            signal_text = f"Signal type: {signal_type}. Data: {json.dumps(signal_data, sort_keys=True)}"
-            
-            response = await self.openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=signal_text
-            )
+            signal_text = f"Signal type: {signal_type}. Data: {canonical_signal_data(signal_data)}"
             
-            return response.data[0].embedding
+            return await self.embed_text(signal_text)
             
         except Exception as e:
             logger.error("Failed to generate signal embedding", error=str(e))
@@ -71,7 +249,7 @@ class EmbeddingService:
         code_content: str, 
         file_path: str,
         language: Optional[str] = None
-    ) -> List[float]:
+    ) -> np.ndarray:
         """Generate an embedding for code patterns."""
         try:
             # Create a structured representation of the code
@@ -80,31 +258,21 @@ class EmbeddingService:
             if language:
                 structured_text += f". Language: {language}"
             
-            structured_text += f". Content: {code_content[:2000]}"  # Limit content size
-            
-            response = await self.openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=structured_text
-            )
+            structured_text += f". Content: {_truncate_tokens(code_content, CODE_CONTENT_MAX_TOKENS)}"
             
-            return response.data[0].embedding
+            return await self.embed_text(structured_text)
             
         except Exception as e:
             logger.error("Failed to generate code pattern embedding", error=str(e))
             raise
     
-    async def generate_query_embedding(self, query: str) -> List[float]:
+    async def generate_query_embedding(self, query: str) -> np.ndarray:
         """Generate an embedding for a search query."""
         try:
             # Structure the query for better semantic matching
             structured_query = f"Search query: {query}"
             
-            response = await self.openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=structured_query
-            )
-            
-            return response.data[0].embedding
+            return await self.embed_text(structured_query)
             
         except Exception as e:
             logger.error("Failed to generate query embedding", error=str(e))
@@ -114,23 +282,26 @@ class EmbeddingService:
         self, 
         texts: List[str], 
         batch_size: int = 100
-    ) -> List[List[float]]:
-        """Generate embeddings for multiple texts in batches."""
+    ) -> np.ndarray:
+        """Generate embeddings for multiple texts in batches.
+        
+        Returns a (len(texts), dim) float32 matrix.
+        """
         try:
             embeddings = []
             
             for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
+                batch = [_truncate_tokens(text) for text in texts[i:i + batch_size]]
                 
                 response = await self.openai_client.embeddings.create(
-                    model="text-embedding-3-small",
+                    model=EMBEDDING_MODEL,
                     input=batch
                 )
                 
                 batch_embeddings = [data.embedding for data in response.data]
                 embeddings.extend(batch_embeddings)
             
-            return embeddings
+            return np.asarray(embeddings, dtype=np.float32)
             
         except Exception as e:
             logger.error("Failed to generate batch embeddings", error=str(e))
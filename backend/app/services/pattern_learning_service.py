@@ -1,15 +1,41 @@
 """Service for learning coding patterns from signals and providing intelligent suggestions."""
 
-import json
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+import asyncio
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import orjson
 import structlog
+from postgrest.exceptions import APIError
 from supabase import Client
 
 from .embedding_service import EmbeddingService
 
 logger = structlog.get_logger(__name__)
 
+# Distinct contexts/triggers/frameworks kept per learned pattern
+MAX_PATTERN_DETAILS = 10
+
+# Postgres: no unique index matches the ON CONFLICT columns
+_NO_CONFLICT_TARGET = "42P10"
+
+
+def _group(
+    signals: Iterable[Dict[str, Any]], 
+    key_fn: Callable[[Dict[str, Any]], str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Group signals by key_fn, preserving first-seen key order."""
+    groups = defaultdict(list)
+    for signal in signals:
+        groups[key_fn(signal)].append(signal)
+    return groups
+
+
+def _top_values(values: Iterable[str], limit: int = MAX_PATTERN_DETAILS) -> List[str]:
+    """Return the most frequent non-empty values, most common first."""
+    return [value for value, _ in Counter(v for v in values if v).most_common(limit)]
+
 
 class PatternLearningService:
     """Service for learning coding patterns from user signals and providing suggestions."""
@@ -25,34 +51,27 @@ class PatternLearningService:
     ) -> List[Dict[str, Any]]:
         """Learn patterns from recent coding signals."""
         try:
-            # Get recent signals
-            cutoff_date = datetime.utcnow() - timedelta(days=lookback_days)
+            since = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).isoformat()
             
-            signals_result = self.supabase.table("coding_signals").select("*").eq(
-                "user_id", user_id
-            ).gte("created_at", cutoff_date.isoformat()).execute()
+            # Let Postgres group and threshold the signals
+            try:
+                aggregates = self.supabase.rpc("aggregate_coding_signals", {
+                    "user_id_param": user_id,
+                    "since": since
+                }).execute().data
+                learned_patterns = [
+                    pattern for pattern in map(self._pattern_from_aggregate, aggregates) if pattern
+                ]
+            except Exception as e:
+                # Databases without the aggregate_coding_signals migration
+                logger.warning("Signal aggregation RPC unavailable, aggregating locally", error=str(e))
+                learned_patterns = await self._learn_from_signal_rows(user_id, since)
             
-            if not signals_result.data:
-                logger.info("No recent signals found for pattern learning", user_id=user_id)
+            if not learned_patterns:
+                logger.info("No recent signal patterns found for pattern learning", user_id=user_id)
                 return []
             
-            # Group signals by type
-            signals_by_type = {}
-            for signal in signals_result.data:
-                signal_type = signal["signal_type"]
-                if signal_type not in signals_by_type:
-                    signals_by_type[signal_type] = []
-                signals_by_type[signal_type].append(signal)
-            
-            # Learn patterns from each signal type
-            learned_patterns = []
-            for signal_type, signals in signals_by_type.items():
-                patterns = await self._learn_patterns_from_signals(signal_type, signals)
-                learned_patterns.extend(patterns)
-            
-            # Store learned patterns
-            for pattern in learned_patterns:
-                await self._store_learned_pattern(user_id, pattern)
+            await self._store_learned_patterns(user_id, learned_patterns)
             
             return learned_patterns
             
@@ -60,6 +79,83 @@ class PatternLearningService:
             logger.error("Failed to learn from signals", error=str(e), user_id=user_id)
             raise
     
+    async def _learn_from_signal_rows(
+        self, 
+        user_id: str, 
+        since: str
+    ) -> List[Dict[str, Any]]:
+        """Fetch raw signals and learn patterns from them in Python."""
+        signals_result = self.supabase.table("coding_signals").select("signal_type, signal_data").eq(
+            "user_id", user_id
+        ).gte("created_at", since).execute()
+        
+        if not signals_result.data:
+            return []
+        
+        # Group signals by type
+        signals_by_type = _group(signals_result.data, lambda s: s["signal_type"])
+        
+        # Learn patterns from each signal type
+        learned_patterns = []
+        for signal_type, signals in signals_by_type.items():
+            patterns = await self._learn_patterns_from_signals(signal_type, signals)
+            learned_patterns.extend(patterns)
+        
+        return learned_patterns
+    
+    def _pattern_from_aggregate(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build a learned pattern from one aggregate_coding_signals row."""
+        signal_type = row["signal_type"]
+        key = row["group_key"]
+        frequency = row["frequency"]
+        details = row["details"] or []
+        
+        if signal_type == "file_created":
+            return {
+                "pattern_name": f"frequent_{key}_file_creation",
+                "pattern_description": f"Frequently creates {key} files",
+                "pattern_data": {
+                    "file_extension": key,
+                    "frequency": frequency,
+                    "common_paths": self._common_dirs(details)
+                },
+                "confidence_score": min(frequency / 10.0, 1.0)
+            }
+        if signal_type == "code_pattern_used":
+            return {
+                "pattern_name": f"preferred_{key}_pattern",
+                "pattern_description": f"Prefers {key} pattern",
+                "pattern_data": {
+                    "pattern_type": key,
+                    "frequency": frequency,
+                    "contexts": _top_values(details)
+                },
+                "confidence_score": min(frequency / 5.0, 1.0)
+            }
+        if signal_type == "refactor_applied":
+            return {
+                "pattern_name": f"common_{key}_refactoring",
+                "pattern_description": f"Commonly applies {key} refactoring",
+                "pattern_data": {
+                    "refactor_type": key,
+                    "frequency": frequency,
+                    "triggers": _top_values(details)
+                },
+                "confidence_score": min(frequency / 3.0, 1.0)
+            }
+        if signal_type == "test_written":
+            return {
+                "pattern_name": f"preferred_{key}_testing",
+                "pattern_description": f"Prefers {key} testing approach",
+                "pattern_data": {
+                    "test_type": key,
+                    "frequency": frequency,
+                    "frameworks": _top_values(details)
+                },
+                "confidence_score": min(frequency / 3.0, 1.0)
+            }
+        return None
+    
     async def _learn_patterns_from_signals(
         self, 
         signal_type: str, 
@@ -79,194 +175,141 @@ class PatternLearningService:
         
         return patterns
     
+    def _patterns_from_groups(
+        self, 
+        signal_type: str, 
+        groups: Dict[str, List[Dict[str, Any]]], 
+        min_count: int, 
+        detail_field: str
+    ) -> List[Dict[str, Any]]:
+        """Turn grouped signals into patterns, mirroring aggregate_coding_signals."""
+        patterns = []
+        for key, group in groups.items():
+            if len(group) >= min_count:
+                patterns.append(self._pattern_from_aggregate({
+                    "signal_type": signal_type,
+                    "group_key": key,
+                    "frequency": len(group),
+                    "details": [s["signal_data"].get(detail_field, "") for s in group]
+                }))
+        return patterns
+    
     async def _learn_file_creation_patterns(
         self, 
         signals: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Learn patterns from file creation signals."""
-        patterns = []
-        
         # Group by file extension/type
-        file_types = {}
-        for signal in signals:
-            file_path = signal["signal_data"].get("file_path", "")
-            if "." in file_path:
-                ext = file_path.split(".")[-1].lower()
-                if ext not in file_types:
-                    file_types[ext] = []
-                file_types[ext].append(signal)
-        
-        # Create patterns for common file types
-        for ext, ext_signals in file_types.items():
-            if len(ext_signals) >= 3:  # Minimum threshold for pattern recognition
-                pattern = {
-                    "pattern_name": f"frequent_{ext}_file_creation",
-                    "pattern_description": f"Frequently creates {ext} files",
-                    "pattern_data": {
-                        "file_extension": ext,
-                        "frequency": len(ext_signals),
-                        "common_paths": self._extract_common_paths(ext_signals)
-                    },
-                    "confidence_score": min(len(ext_signals) / 10.0, 1.0)
-                }
-                patterns.append(pattern)
-        
-        return patterns
+        file_types = _group(
+            (s for s in signals if "." in s["signal_data"].get("file_path", "")),
+            lambda s: s["signal_data"]["file_path"].split(".")[-1].lower()
+        )
+        # Minimum threshold for pattern recognition
+        return self._patterns_from_groups("file_created", file_types, 3, "file_path")
     
     async def _learn_code_patterns(
         self, 
         signals: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Learn patterns from code pattern usage signals."""
-        patterns = []
-        
-        # Group by pattern type
-        pattern_types = {}
-        for signal in signals:
-            pattern_type = signal["signal_data"].get("pattern_type", "unknown")
-            if pattern_type not in pattern_types:
-                pattern_types[pattern_type] = []
-            pattern_types[pattern_type].append(signal)
-        
-        # Create patterns for frequently used code patterns
-        for pattern_type, type_signals in pattern_types.items():
-            if len(type_signals) >= 2:
-                pattern = {
-                    "pattern_name": f"preferred_{pattern_type}_pattern",
-                    "pattern_description": f"Prefers {pattern_type} pattern",
-                    "pattern_data": {
-                        "pattern_type": pattern_type,
-                        "frequency": len(type_signals),
-                        "contexts": [s["signal_data"].get("context", "") for s in type_signals]
-                    },
-                    "confidence_score": min(len(type_signals) / 5.0, 1.0)
-                }
-                patterns.append(pattern)
-        
-        return patterns
+        pattern_types = _group(signals, lambda s: s["signal_data"].get("pattern_type", "unknown"))
+        return self._patterns_from_groups("code_pattern_used", pattern_types, 2, "context")
     
     async def _learn_refactoring_patterns(
         self, 
         signals: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Learn patterns from refactoring signals."""
-        patterns = []
-        
-        # Group by refactoring type
-        refactor_types = {}
-        for signal in signals:
-            refactor_type = signal["signal_data"].get("refactor_type", "unknown")
-            if refactor_type not in refactor_types:
-                refactor_types[refactor_type] = []
-            refactor_types[refactor_type].append(signal)
-        
-        # Create patterns for common refactoring approaches
-        for refactor_type, type_signals in refactor_types.items():
-            if len(type_signals) >= 2:
-                pattern = {
-                    "pattern_name": f"common_{refactor_type}_refactoring",
-                    "pattern_description": f"Commonly applies {refactor_type} refactoring",
-                    "pattern_data": {
-                        "refactor_type": refactor_type,
-                        "frequency": len(type_signals),
-                        "triggers": [s["signal_data"].get("trigger", "") for s in type_signals]
-                    },
-                    "confidence_score": min(len(type_signals) / 3.0, 1.0)
-                }
-                patterns.append(pattern)
-        
-        return patterns
+        refactor_types = _group(signals, lambda s: s["signal_data"].get("refactor_type", "unknown"))
+        return self._patterns_from_groups("refactor_applied", refactor_types, 2, "trigger")
     
     async def _learn_testing_patterns(
         self, 
         signals: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Learn patterns from testing signals."""
-        patterns = []
-        
-        # Group by test type
-        test_types = {}
-        for signal in signals:
-            test_type = signal["signal_data"].get("test_type", "unknown")
-            if test_type not in test_types:
-                test_types[test_type] = []
-            test_types[test_type].append(signal)
-        
-        # Create patterns for testing preferences
-        for test_type, type_signals in test_types.items():
-            if len(type_signals) >= 2:
-                pattern = {
-                    "pattern_name": f"preferred_{test_type}_testing",
-                    "pattern_description": f"Prefers {test_type} testing approach",
-                    "pattern_data": {
-                        "test_type": test_type,
-                        "frequency": len(type_signals),
-                        "frameworks": [s["signal_data"].get("framework", "") for s in type_signals]
-                    },
-                    "confidence_score": min(len(type_signals) / 3.0, 1.0)
-                }
-                patterns.append(pattern)
-        
-        return patterns
+        test_types = _group(signals, lambda s: s["signal_data"].get("test_type", "unknown"))
+        return self._patterns_from_groups("test_written", test_types, 2, "framework")
     
-    def _extract_common_paths(self, signals: List[Dict[str, Any]]) -> List[str]:
-        """Extract common directory paths from file creation signals."""
-        paths = []
-        for signal in signals:
-            file_path = signal["signal_data"].get("file_path", "")
-            if "/" in file_path:
-                dir_path = "/".join(file_path.split("/")[:-1])
-                paths.append(dir_path)
-        
-        # Count path frequencies
-        path_counts = {}
-        for path in paths:
-            path_counts[path] = path_counts.get(path, 0) + 1
-        
-        # Return most common paths
-        return sorted(path_counts.keys(), key=lambda x: path_counts[x], reverse=True)[:5]
+    def _common_dirs(self, file_paths: Iterable[str]) -> List[str]:
+        """Return the most common parent directories of the given file paths."""
+        path_counts = Counter(
+            file_path.rsplit("/", 1)[0] for file_path in file_paths if "/" in file_path
+        )
+        return [path for path, _ in path_counts.most_common(5)]
     
-    async def _store_learned_pattern(
+    async def _store_learned_patterns(
         self, 
         user_id: str, 
-        pattern: Dict[str, Any]
+        patterns: List[Dict[str, Any]]
     ) -> None:
-        """Store a learned pattern in the database."""
+        """Store learned patterns in the database with a single upsert."""
         try:
-            # Generate embedding for the pattern
-            pattern_text = f"{pattern['pattern_name']}: {pattern['pattern_description']}"
-            embedding = await self.embedding_service.generate_preference_embedding(pattern_text)
+            # Concurrent embedding requests coalesce into batched calls in the
+            # embedding service
+            embeddings = await asyncio.gather(*(
+                self.embedding_service.generate_preference_embedding(
+                    f"{pattern['pattern_name']}: {pattern['pattern_description']}"
+                )
+                for pattern in patterns
+            ))
             
-            # Check if pattern already exists
-            existing = self.supabase.table("preference_patterns").select("*").eq(
-                "user_id", user_id
-            ).eq("pattern_name", pattern["pattern_name"]).execute()
-            
-            if existing.data:
-                # Update existing pattern
-                self.supabase.table("preference_patterns").update({
-                    "pattern_description": pattern["pattern_description"],
-                    "pattern_data": pattern["pattern_data"],
-                    "embedding": embedding,
-                    "confidence_score": pattern["confidence_score"],
-                    "signal_count": pattern["pattern_data"].get("frequency", 0)
-                }).eq("id", existing.data[0]["id"]).execute()
-            else:
-                # Insert new pattern
-                self.supabase.table("preference_patterns").insert({
+            rows = [
+                {
                     "user_id": user_id,
                     "pattern_name": pattern["pattern_name"],
                     "pattern_description": pattern["pattern_description"],
                     "pattern_data": pattern["pattern_data"],
-                    "embedding": embedding,
+                    "embedding": embedding.tolist(),
                     "confidence_score": pattern["confidence_score"],
                     "signal_count": pattern["pattern_data"].get("frequency", 0)
-                }).execute()
+                }
+                for pattern, embedding in zip(patterns, embeddings)
+            ]
+            
+            # The supabase client is synchronous; keep it off the event loop
+            await asyncio.to_thread(self._write_learned_patterns, rows)
                 
         except Exception as e:
-            logger.error("Failed to store learned pattern", error=str(e), pattern=pattern["pattern_name"])
+            logger.error("Failed to store learned patterns", error=str(e), user_id=user_id, count=len(patterns))
             raise
     
+    def _write_learned_patterns(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert or update learned pattern rows (blocking)."""
+        # Single round trip; relies on the unique (user_id, pattern_name) index
+        try:
+            self.supabase.table("preference_patterns").upsert(
+                rows, on_conflict="user_id,pattern_name"
+            ).execute()
+        except APIError as e:
+            if e.code != _NO_CONFLICT_TARGET:
+                raise
+            logger.warning(
+                "preference_patterns has no unique (user_id, pattern_name) index; "
+                "apply migration 20241222_preference_patterns_unique.sql. "
+                "Falling back to select then insert/update",
+                error=str(e),
+            )
+            self._write_learned_patterns_without_index(rows)
+    
+    def _write_learned_patterns_without_index(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert or update learned pattern rows by looking up existing ids first (blocking)."""
+        table = self.supabase.table("preference_patterns")
+        existing = table.select("id, pattern_name").eq(
+            "user_id", rows[0]["user_id"]
+        ).in_("pattern_name", [row["pattern_name"] for row in rows]).execute()
+        ids = {row["pattern_name"]: row["id"] for row in existing.data}
+        
+        new_rows = []
+        for row in rows:
+            pattern_id = ids.get(row["pattern_name"])
+            if pattern_id is None:
+                new_rows.append(row)
+            else:
+                table.update(row).eq("id", pattern_id).execute()
+        if new_rows:
+            table.insert(new_rows).execute()
+    
     async def get_suggestions_for_context(
         self, 
         user_id: str, 
@@ -278,36 +321,31 @@ class PatternLearningService:
             # Generate embedding for the context
             context_embedding = await self.embedding_service.generate_query_embedding(context)
             
+            # The RPCs take the vector as a JSON array
+            query_embedding = context_embedding.tolist()
+            
             # Find similar preferences
             similar_prefs = self.supabase.rpc("find_similar_preferences", {
                 "user_id_param": user_id,
-                "query_embedding": context_embedding,
+                "query_embedding": query_embedding,
                 "similarity_threshold": 0.6,
                 "max_results": max_suggestions
             }).execute()
             
             # Find similar patterns
-            similar_patterns = self.supabase.table("preference_patterns").select("*").eq(
-                "user_id", user_id
-            ).execute()
-            
-            # Calculate similarities for patterns
-            pattern_similarities = []
-            for pattern in similar_patterns.data:
-                if pattern["embedding"]:
-                    # Calculate cosine similarity
-                    similarity = self._calculate_cosine_similarity(
-                        context_embedding, 
-                        pattern["embedding"]
-                    )
-                    if similarity > 0.6:
-                        pattern_similarities.append({
-                            "pattern": pattern,
-                            "similarity": similarity
-                        })
-            
-            # Sort by similarity
-            pattern_similarities.sort(key=lambda x: x["similarity"], reverse=True)
+            try:
+                similar_patterns = self.supabase.rpc("find_similar_patterns", {
+                    "user_id_param": user_id,
+                    "query_embedding": query_embedding,
+                    "similarity_threshold": 0.6,
+                    "max_results": max_suggestions
+                }).execute().data
+            except Exception as e:
+                # Databases without the find_similar_patterns migration
+                logger.warning("Pattern similarity RPC unavailable, ranking locally", error=str(e))
+                similar_patterns = self._rank_patterns_locally(
+                    user_id, context_embedding, 0.6, max_suggestions
+                )
             
             # Combine suggestions
             suggestions = []
@@ -324,14 +362,13 @@ class PatternLearningService:
                 })
             
             # Add pattern-based suggestions
-            for item in pattern_similarities[:max_suggestions]:
-                pattern = item["pattern"]
+            for pattern in similar_patterns:
                 suggestions.append({
                     "type": "pattern",
                     "title": f"Based on your pattern: {pattern['pattern_name']}",
                     "description": pattern["pattern_description"],
                     "confidence": pattern["confidence_score"],
-                    "similarity": item["similarity"],
+                    "similarity": pattern["similarity"],
                     "data": pattern["pattern_data"]
                 })
             
@@ -340,19 +377,50 @@ class PatternLearningService:
         except Exception as e:
             logger.error("Failed to get suggestions", error=str(e), user_id=user_id)
             raise
+
     
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        import math
+    def _rank_patterns_locally(
+        self,
+        user_id: str,
+        query_embedding: np.ndarray,
+        similarity_threshold: float,
+        max_results: int
+    ) -> List[Dict[str, Any]]:
+        """Rank a user's patterns by cosine similarity in one vectorized pass."""
+        result = self.supabase.table("preference_patterns").select(
+            "id, pattern_name, pattern_description, pattern_data, confidence_score, embedding"
+        ).eq("user_id", user_id).execute()
+        
+        rows = [row for row in result.data if row.get("embedding")]
+        if not rows or max_results <= 0:
+            return []
+        
+        # pgvector columns come back from PostgREST as "[...]" strings
+        matrix = np.asarray(
+            [orjson.loads(r["embedding"]) if isinstance(r["embedding"], str) else r["embedding"] for r in rows],
+            dtype=np.float32
+        )
+        query = np.asarray(query_embedding, dtype=np.float32)
         
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(a * a for a in vec2))
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        norms[norms == 0] = np.inf  # zero vectors score 0
+        sims = (matrix @ query) / norms
         
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0
+        # Top-k without sorting every row
+        k = min(max_results, len(rows))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
         
-        return dot_product / (magnitude1 * magnitude2)
+        ranked = []
+        for idx in top:
+            similarity = float(sims[idx])
+            if similarity <= similarity_threshold:
+                break
+            row = dict(rows[idx])
+            row.pop("embedding", None)
+            row["similarity"] = similarity
+            ranked.append(row)
+        return ranked
 
 
 def get_pattern_learning_service(
@@ -1,5 +1,6 @@
 """Supabase client for database operations."""
 
+import asyncio
 import os
 from typing import Any, Dict, List, Optional
 
@@ -11,8 +12,8 @@ logger = structlog.get_logger(__name__)
 _supabase_client: Optional[Client] = None
 
 
-async def get_supabase_client() -> Client:
-    """Get or create Supabase client."""
+def get_supabase_client() -> Client:
+    """Get or create the shared Supabase client."""
     global _supabase_client
     
     if _supabase_client is None:
@@ -31,13 +32,12 @@ async def get_supabase_client() -> Client:
 async def get_style_profile(user_id: str) -> Optional[Dict[str, Any]]:
     """Get user's style profile."""
     try:
-        import asyncio
-        client = await get_supabase_client()
+        client = get_supabase_client()
         
         # Add timeout to prevent hanging
         result = await asyncio.wait_for(
             asyncio.to_thread(
-                lambda: client.table("style_profiles").select("*").eq("user_id", user_id).execute()
+                lambda: client.table("style_profiles").select("id, user_id, tokens").eq("user_id", user_id).execute()
             ),
             timeout=10.0  # 10 second timeout
         )
@@ -57,13 +57,12 @@ async def get_style_profile(user_id: str) -> Optional[Dict[str, Any]]:
 async def get_pattern(slug: str) -> Optional[Dict[str, Any]]:
     """Get development pattern by slug."""
     try:
-        import asyncio
-        client = await get_supabase_client()
+        client = get_supabase_client()
         
         # Add timeout to prevent hanging
         result = await asyncio.wait_for(
             asyncio.to_thread(
-                lambda: client.table("patterns").select("*").eq("slug", slug).execute()
+                lambda: client.table("patterns").select("id, slug, name, description, template").eq("slug", slug).execute()
             ),
             timeout=10.0  # 10 second timeout
         )
@@ -87,7 +86,7 @@ async def create_plan(
 ) -> str:
     """Create a new plan and return its ID."""
     try:
-        client = await get_supabase_client()
+        client = get_supabase_client()
         result = client.table("plans").insert({
             "project_id": project_id,
             "user_id": user_id,
@@ -106,8 +105,8 @@ async def create_plan(
 async def get_plan(plan_id: str) -> Optional[Dict[str, Any]]:
     """Get plan by ID."""
     try:
-        client = await get_supabase_client()
-        result = client.table("plans").select("*").eq("id", plan_id).execute()
+        client = get_supabase_client()
+        result = client.table("plans").select("id, project_id, user_id, plan_json, status").eq("id", plan_id).execute()
         
         if result.data:
             return result.data[0]
@@ -121,7 +120,7 @@ async def get_plan(plan_id: str) -> Optional[Dict[str, Any]]:
 async def update_plan(plan_id: str, plan_json: Dict[str, Any]) -> bool:
     """Update plan with new JSON."""
     try:
-        client = await get_supabase_client()
+        client = get_supabase_client()
         result = client.table("plans").update({
             "plan_json": plan_json,
             "updated_at": "now()"
@@ -141,7 +140,7 @@ async def create_plan_revision(
 ) -> bool:
     """Create a plan revision record."""
     try:
-        client = await get_supabase_client()
+        client = get_supabase_client()
         result = client.table("plan_revisions").insert({
             "plan_id": plan_id,
             "message_id": message_id,
@@ -163,7 +162,7 @@ async def create_plan_message(
 ) -> str:
     """Create a plan message and return its ID."""
     try:
-        client = await get_supabase_client()
+        client = get_supabase_client()
         result = client.table("plan_messages").insert({
             "plan_id": plan_id,
             "user_question": user_question,
@@ -188,7 +187,7 @@ async def log_dev_event(
 ) -> bool:
     """Log a development event."""
     try:
-        client = await get_supabase_client()
+        client = get_supabase_client()
         result = client.table("dev_events").insert({
             "event_type": event_type,
             "user_id": user_id,
@@ -1,8 +1,15 @@
 """JSON Patch utilities for plan modifications."""
 
-from typing import Any, Dict, List
+import copy
+import functools
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
 
 import jsonpatch
+from jsonpatch import InvalidJsonPatch, JsonPatchConflict, JsonPatchTestFailed
+from jsonpointer import JsonPointerException
+import orjson
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -17,52 +24,355 @@ ALLOWED_PATHS = {
     "/prBody"
 }
 
+# RFC 6902 operation names
+_VALID_OPS = frozenset({"add", "remove", "replace", "move", "copy", "test"})
+_FROM_OPS = frozenset({"move", "copy"})
+
+# Bounded LRU of patch shapes, (op, path, from) per operation, that passed
+# validation; only those fields decide validity, so values are ignored
+VALID_SHAPE_CACHE_SIZE = 1024
+_valid_shapes: "OrderedDict[Tuple[Tuple[Any, Any, Any], ...], None]" = OrderedDict()
+
+# Canonical array index tokens, so common indices skip validation and int()
+_SMALL_INT = {str(i): i for i in range(256)}
+
+# Same rules as jsonpointer: no signs or leading zeros, and only ~0 / ~1 escapes
+_ARRAY_INDEX_MATCH = re.compile(r"0|[1-9][0-9]*").fullmatch
+_INVALID_ESCAPE_SEARCH = re.compile(r"~[^01]|~$").search
+
+
+def _allowed_path_pattern(allowed_path: str) -> str:
+    """Translate an ALLOWED_PATHS entry into a regex fragment.
+    
+    A trailing "*" allows anything below the prefix ("/steps/*" covers
+    "/steps/0/title"); an inner "*" matches exactly one reference token.
+    """
+    head, star, tail = allowed_path.rpartition("*")
+    if star and not tail:
+        return "[^/]+".join(map(re.escape, head.split("*"))) + ".*"
+    return "[^/]+".join(map(re.escape, allowed_path.split("*")))
+
+
+# All ALLOWED_PATHS compiled into one anchored alternation
+_ALLOWED_PATH_MATCH = re.compile(
+    "(?:" + "|".join(sorted(map(_allowed_path_pattern, ALLOWED_PATHS))) + ")"
+).fullmatch
+
+
+# Make orjson reject (rather than stringify) dates and dataclasses
+_PASSTHROUGH = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _json_deepcopy(value: Any) -> Any:
+    """Deep-copy a JSON-shaped value via an orjson round trip.
+
+    Falls back to copy.deepcopy for values orjson cannot serialize.
+    """
+    try:
+        return orjson.loads(orjson.dumps(value, option=_PASSTHROUGH))
+    except TypeError:
+        return copy.deepcopy(value)
+
+
+def _unescape(token: str) -> str:
+    """Decode ~1 and ~0 escapes in a JSON Pointer reference token."""
+    if "~" not in token:
+        return token
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_ptr(pointer: str) -> Tuple[str, ...]:
+    """Split a JSON Pointer into its unescaped reference tokens.
+
+    Plan patches keep hitting the same few paths, so results are memoized.
+    """
+    if not pointer:
+        return ()
+    if pointer[0] != "/":
+        raise JsonPointerException("Location must start with /")
+    invalid_escape = _INVALID_ESCAPE_SEARCH(pointer)
+    if invalid_escape:
+        raise JsonPointerException(f"Found invalid escape {invalid_escape.group()}")
+    return tuple(_unescape(token) for token in pointer[1:].split("/"))
+
+
+def _array_index(token: str) -> int:
+    """Parse a JSON Pointer array index token (no signs or leading zeros)."""
+    index = _SMALL_INT.get(token)
+    if index is not None:
+        return index
+    if not _ARRAY_INDEX_MATCH(token):
+        raise JsonPointerException(f"'{token}' is not a valid sequence index")
+    return int(token)
+
+
+def _step(doc: Any, part: str) -> Any:
+    """Walk one pointer step into a plain dict or list."""
+    doc_type = type(doc)
+    if doc_type is dict:
+        try:
+            return doc[part]
+        except KeyError:
+            raise JsonPointerException(f"member '{part}' not found") from None
+    if doc_type is list:
+        try:
+            return doc[_array_index(part)]
+        except IndexError:
+            raise JsonPointerException(f"index '{part}' is out of bounds") from None
+    raise JsonPointerException(f"Cannot apply token '{part}' to non-container type {doc_type}")
+
+
+def _resolve(doc: Any, parts: Tuple[str, ...]) -> Any:
+    """Return the value at parts without copying anything."""
+    for part in parts:
+        doc = _step(doc, part)
+    return doc
+
+
+def _resolve_from(doc: Any, parts: Tuple[str, ...]) -> Any:
+    """Resolve a move/copy "from" location; a missing last token conflicts, as in jsonpatch."""
+    if not parts:
+        return doc
+    parent, last = _resolve(doc, parts[:-1]), parts[-1]
+    parent_type = type(parent)
+    if parent_type is dict:
+        if last not in parent:
+            raise JsonPatchConflict(f"member '{last}' not found")
+        return parent[last]
+    if parent_type is list:
+        index = _array_index(last)
+        if index >= len(parent):
+            raise JsonPatchConflict(f"index '{last}' is out of bounds")
+        return parent[index]
+    return _step(parent, last)
+
+
+def _own(container: Any, owned: Dict[int, Any]) -> Any:
+    """Return a private shallow copy of container, reusing one made earlier."""
+    if id(container) in owned:
+        return container
+    if type(container) is dict:
+        clone = dict(container)
+    elif type(container) is list:
+        clone = list(container)
+    else:
+        raise JsonPatchConflict(f"cannot patch inside {type(container).__name__}")
+    # Keep clones referenced so their ids stay unique for this call
+    owned[id(clone)] = clone
+    return clone
+
+
+def _cow_parent(root: Any, parts: Tuple[str, ...], owned: Dict[int, Any]) -> Tuple[Any, Any]:
+    """Copy the containers from root down to the parent of parts.
+
+    Returns the (possibly new) root and the privately owned parent container.
+    Subtrees off the path stay shared with the original document.
+    """
+    root = parent = _own(root, owned)
+    for part in parts[:-1]:
+        key = part if type(parent) is dict else _array_index(part)
+        child = _own(_step(parent, part), owned)
+        parent[key] = child
+        parent = child
+    return root, parent
+
+
+def _cow_add(root: Any, parts: Tuple[str, ...], value: Any, owned: Dict[int, Any]) -> Any:
+    if not parts:
+        return value
+    root, parent = _cow_parent(root, parts, owned)
+    last = parts[-1]
+    if type(parent) is dict:
+        parent[last] = value
+    elif last == "-":
+        parent.append(value)
+    else:
+        index = _array_index(last)
+        if index > len(parent):
+            raise JsonPatchConflict("can't insert outside of list")
+        parent.insert(index, value)
+    return root
+
+
+def _cow_remove(root: Any, parts: Tuple[str, ...], owned: Dict[int, Any]) -> Any:
+    if not parts:
+        raise JsonPatchConflict("can't remove the whole document")
+    root, parent = _cow_parent(root, parts, owned)
+    last = parts[-1]
+    try:
+        del parent[last if type(parent) is dict else _array_index(last)]
+    except (KeyError, IndexError):
+        raise JsonPatchConflict(f"can't remove a non-existent object '{last}'") from None
+    return root
+
+
+def _cow_replace(root: Any, parts: Tuple[str, ...], value: Any, owned: Dict[int, Any]) -> Any:
+    if not parts:
+        return value
+    root, parent = _cow_parent(root, parts, owned)
+    last = parts[-1]
+    if type(parent) is dict:
+        if last not in parent:
+            raise JsonPatchConflict(f"can't replace a non-existent object '{last}'")
+        parent[last] = value
+    else:
+        index = _array_index(last)
+        if index >= len(parent):
+            raise JsonPatchConflict("can't replace outside of list")
+        parent[index] = value
+    return root
+
+
+def _op_value(operation: Dict[str, Any]) -> Any:
+    """Return the operation's value, rejecting the patch like jsonpatch if it is missing."""
+    try:
+        return operation["value"]
+    except KeyError:
+        raise InvalidJsonPatch("The operation does not contain a 'value' member") from None
+
+
+def _do_add(root: Any, operation: Dict[str, Any], parts: Tuple[str, ...], owned: Dict[int, Any]) -> Any:
+    return _cow_add(root, parts, _json_deepcopy(_op_value(operation)), owned)
+
+
+def _do_remove(root: Any, operation: Dict[str, Any], parts: Tuple[str, ...], owned: Dict[int, Any]) -> Any:
+    return _cow_remove(root, parts, owned)
+
+
+def _do_replace(root: Any, operation: Dict[str, Any], parts: Tuple[str, ...], owned: Dict[int, Any]) -> Any:
+    return _cow_replace(root, parts, _json_deepcopy(_op_value(operation)), owned)
+
+
+def _do_test(root: Any, operation: Dict[str, Any], parts: Tuple[str, ...], owned: Dict[int, Any]) -> Any:
+    try:
+        actual = _resolve(root, parts)
+    except JsonPointerException as e:
+        raise JsonPatchTestFailed(str(e)) from None
+    expected = _op_value(operation)
+    if actual != expected:
+        raise JsonPatchTestFailed(
+            f"{actual} ({type(actual)}) is not equal to tested value {expected} ({type(expected)})"
+        )
+    return root
+
+
+def _do_move(root: Any, operation: Dict[str, Any], parts: Tuple[str, ...], owned: Dict[int, Any]) -> Any:
+    from_path = operation["from"]
+    if operation["path"].startswith(from_path + "/"):
+        raise JsonPatchConflict("Cannot move values into their own children")
+    from_parts = _split_ptr(from_path)
+    value = _resolve_from(root, from_parts)
+    return _cow_add(_cow_remove(root, from_parts, owned), parts, value, owned)
+
+
+def _do_copy(root: Any, operation: Dict[str, Any], parts: Tuple[str, ...], owned: Dict[int, Any]) -> Any:
+    value = _json_deepcopy(_resolve_from(root, _split_ptr(operation["from"])))
+    return _cow_add(root, parts, value, owned)
+
+
+# Copy-on-write handler per RFC 6902 operation
+_COW_HANDLERS: Dict[str, Callable[[Any, Dict[str, Any], Tuple[str, ...], Dict[int, Any]], Any]] = {
+    "add": _do_add,
+    "remove": _do_remove,
+    "replace": _do_replace,
+    "test": _do_test,
+    "move": _do_move,
+    "copy": _do_copy,
+}
+
 
 def validate_patch_path(path: str) -> bool:
     """Validate that a patch path is allowed."""
-    # Check exact matches
-    if path in ALLOWED_PATHS:
-        return True
+    return _ALLOWED_PATH_MATCH(path) is not None
+
+
+def _validate_operation(operation: Dict[str, Any]) -> bool:
+    """Validate a single patch operation, logging the reason it is rejected."""
+    if "path" not in operation:
+        logger.error("Patch operation missing 'path' field", operation=operation)
+        return False
+    
+    if not validate_patch_path(operation["path"]):
+        logger.error("Patch operation has invalid path", path=operation["path"])
+        return False
+    
+    # Validate operation type
+    op = operation.get("op")
+    if op not in _VALID_OPS:
+        logger.error("Invalid patch operation", op=op)
+        return False
     
-    # Check wildcard patterns
-    for allowed_path in ALLOWED_PATHS:
-        if "*" in allowed_path:
-            # Convert wildcard pattern to regex-like matching
-            pattern = allowed_path.replace("*", ".*")
-            if path.startswith(pattern.split(".*")[0]):
-                return True
+    # move/copy read from a second pointer, which must be allowed too
+    if op in _FROM_OPS and not validate_patch_path(operation.get("from", "")):
+        logger.error("Patch operation has invalid from path", path=operation.get("from"))
+        return False
     
-    return False
+    return True
 
 
 def validate_patch_operations(patch: List[Dict[str, Any]]) -> bool:
     """Validate all patch operations."""
+    try:
+        shape = tuple((o.get("op"), o.get("path"), o.get("from")) for o in patch)
+        if shape in _valid_shapes:
+            _valid_shapes.move_to_end(shape)
+            return True
+    except TypeError:
+        # Unhashable op/path values; validate without caching
+        shape = None
+    
     for operation in patch:
-        if "path" not in operation:
-            logger.error("Patch operation missing 'path' field", operation=operation)
-            return False
-        
-        if not validate_patch_path(operation["path"]):
-            logger.error("Patch operation has invalid path", path=operation["path"])
-            return False
-        
-        # Validate operation type
-        op = operation.get("op")
-        if op not in ["add", "remove", "replace", "move", "copy", "test"]:
-            logger.error("Invalid patch operation", op=op)
+        if not _validate_operation(operation):
             return False
     
+    if shape is not None:
+        _valid_shapes[shape] = None
+        if len(_valid_shapes) > VALID_SHAPE_CACHE_SIZE:
+            _valid_shapes.popitem(last=False)
     return True
 
 
+def _apply_patch_cow(doc: Any, patch: List[Dict[str, Any]]) -> Any:
+    """Apply a patch without mutating doc, copying only the touched spine.
+
+    Each operation shallow-copies the containers along its path; untouched
+    subtrees are shared with doc, so the result must be treated as read-only.
+    The patch is validated up front through the shape cache, so a patch the
+    caller already validated costs one lookup here.
+    """
+    if not validate_patch_operations(patch):
+        raise ValueError("Invalid patch operations")
+    
+    # Fast path for the most common patch: one top-level replace like /title
+    if len(patch) == 1 and type(doc) is dict:
+        operation = patch[0]
+        path = operation["path"]
+        if operation["op"] == "replace" and path.rfind("/") == 0:
+            (key,) = _split_ptr(path)
+            if key not in doc:
+                raise JsonPatchConflict(f"can't replace a non-existent object '{key}'")
+            patched = dict(doc)
+            patched[key] = _json_deepcopy(_op_value(operation))
+            return patched
+    
+    owned: Dict[int, Any] = {}
+    root = doc
+    # Bind module globals to locals for the loop
+    split, handlers = _split_ptr, _COW_HANDLERS
+    for operation in patch:
+        root = handlers[operation["op"]](root, operation, split(operation["path"]), owned)
+    return root
+
+
 def apply_patch(plan_json: Dict[str, Any], patch: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Apply JSON patch to plan JSON."""
+    """Apply JSON patch to plan JSON.
+    
+    The result shares unpatched subtrees with plan_json; do not mutate it.
+    """
     try:
-        if not validate_patch_operations(patch):
-            raise ValueError("Invalid patch operations")
-        
-        # Apply the patch using fastjsonpatch
-        patched_plan = jsonpatch.apply_patch(plan_json, patch)
+        # Validates the patch first; plan_json is left untouched
+        patched_plan = _apply_patch_cow(plan_json, patch)
         
         logger.info("Successfully applied patch", operations_count=len(patch))
         return patched_plan
@@ -84,15 +394,12 @@ def create_patch_diff(original: Dict[str, Any], modified: Dict[str, Any]) -> Lis
 
 
 def preview_patch(plan_json: Dict[str, Any], patch: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Preview the result of applying a patch without modifying the original."""
+    """Preview the result of applying a patch without modifying the original.
+    
+    The preview shares unpatched subtrees with plan_json; do not mutate it.
+    """
     try:
-        if not validate_patch_operations(patch):
-            raise ValueError("Invalid patch operations")
-        
-        # Create a deep copy and apply the patch
-        import copy
-        preview_plan = copy.deepcopy(plan_json)
-        return apply_patch(preview_plan, patch)
+        return _apply_patch_cow(plan_json, patch)
         
     except Exception as e:
         logger.error("Failed to preview patch", error=str(e))
@@ -1,27 +1,107 @@
 #!/usr/bin/env python3
 """Blueprinter CLI - Command-line interface for the Blueprinter development planning tool."""
 
-import asyncio
-import json
+import atexit
+import functools
+import importlib.util
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import click
-import httpx
-import structlog
-import pyperclip
-from rich.console import Console
-from rich.json import JSON
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.text import Text
-
-# Configure logging
-structlog.configure(
-    processors=[
+import orjson
+
+# asyncio, httpx, structlog and rich are imported where they are used so
+# that `blueprinter --help` and other cheap commands don't pay for them
+if TYPE_CHECKING:
+    import asyncio
+    import httpx
+    from rich.console import Console
+    from rich.progress import Progress
+    from rich.table import Table
+
+
+# Request bodies are pre-serialized with orjson and sent as raw content
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Keep-alive HTTP clients shared by every BlueprinterClient on the same event
+# loop, keyed by (loop, base_url, api_key); httpx clients are bound to a loop
+_http_clients: Dict[Tuple[Any, str, Optional[str]], "httpx.AsyncClient"] = {}
+
+# Open `async with BlueprinterClient(...)` blocks per pooled client; on loops
+# other than the CLI runner's, the last one to exit closes the pool
+_http_client_users: Dict[Tuple[Any, str, Optional[str]], int] = {}
+
+
+def _running_loop() -> Optional["asyncio.AbstractEventLoop"]:
+    """Return the running event loop, or None outside of one."""
+    import asyncio
+    
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _get_http_client(base_url: str, api_key: Optional[str]) -> "httpx.AsyncClient":
+    """Return the pooled httpx client for this loop and API, creating it once."""
+    key = (_running_loop(), base_url, api_key)
+    client = _http_clients.get(key)
+    if client is None or client.is_closed:
+        import httpx
+        
+        client = _http_clients[key] = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else {},
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30.0),
+            # HTTP/2 needs the optional h2 package (httpx[http2])
+            http2=importlib.util.find_spec("h2") is not None,
+        )
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients opened on the running event loop."""
+    loop = _running_loop()
+    for key in [key for key in _http_clients if key[0] is loop]:
+        _http_client_users.pop(key, None)
+        await _http_clients.pop(key).aclose()
+
+
+def _close_http_clients_at_exit() -> None:
+    """Close shared clients whose event loop is still usable at interpreter exit."""
+    # tuple(), not list(): the preferences `list` command shadows the builtin here
+    for (loop, _, _), client in tuple(_http_clients.items()):
+        if loop is not None and not loop.is_closed() and not loop.is_running():
+            try:
+                loop.run_until_complete(client.aclose())
+            except RuntimeError as e:
+                # e.g. the loop was closed or started running during shutdown
+                _get_logger().debug("Could not close HTTP client at exit", error=str(e))
+    _http_clients.clear()
+    _http_client_users.clear()
+
+
+atexit.register(_close_http_clients_at_exit)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_console() -> "Console":
+    """Return the shared Rich console, created on first use."""
+    from rich.console import Console
+    
+    return Console()
+
+
+@functools.lru_cache(maxsize=1)
+def _base_processors() -> Tuple[Any, ...]:
+    """Return the structlog processor chain shared by both renderers (built once)."""
+    import structlog
+    
+    return (
         structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
@@ -30,16 +110,77 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+    )
 
-logger = structlog.get_logger(__name__)
-console = Console()
+
+class _NoOpProgress:
+    """Stand-in for Progress when there is no terminal to draw a spinner on."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return None
+    
+    def add_task(self, description: str, **kwargs: Any) -> int:
+        return 0
+    
+    def update(self, task_id: int, **kwargs: Any) -> None:
+        pass
+
+
+def _make_progress() -> "Progress | _NoOpProgress":
+    """Return the spinner progress display used by every command.
+    
+    Piped output and CI runs get a no-op instead, which skips Rich's
+    refresh thread and keeps control codes out of the output.
+    """
+    console = _get_console()
+    if not console.is_terminal or os.environ.get("CI"):
+        return _NoOpProgress()
+    
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        transient=True,
+    )
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """structlog JSONRenderer serializer; stdlib logging handlers expect str."""
+    return orjson.dumps(obj, **kwargs).decode()
+
+
+def _configure_logging(verbose: bool = False) -> None:
+    """Configure structlog; JSON output by default, console output when verbose."""
+    import structlog
+    
+    if verbose:
+        renderer = structlog.dev.ConsoleRenderer()
+    else:
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    structlog.configure(
+        processors=[*_base_processors(), renderer],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def _get_logger(name: str = __name__) -> Any:
+    """Return a structlog logger, applying the default configuration on first use.
+    
+    Commands that never log therefore never pay for configuring structlog.
+    """
+    import structlog
+    
+    if not structlog.is_configured():
+        _configure_logging()
+    return structlog.get_logger(name)
 
 
 class BlueprinterClient:
@@ -48,40 +189,53 @@ class BlueprinterClient:
     def __init__(self, base_url: str = "http://localhost:8000", api_key: Optional[str] = None):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            headers={"Authorization": f"Bearer {api_key}"} if api_key else {},
-            timeout=30.0
-        )
+        # Shared keep-alive pool, so repeated clients skip the TCP/TLS handshake
+        self.client = _get_http_client(self.base_url, api_key)
     
     async def __aenter__(self):
+        self._key = (_running_loop(), self.base_url, self.api_key)
+        if self.client.is_closed:
+            self.client = _get_http_client(self.base_url, self.api_key)
+        _http_client_users[self._key] = _http_client_users.get(self._key, 0) + 1
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        key = self._key
+        users = _http_client_users.get(key, 1) - 1
+        if users > 0:
+            _http_client_users[key] = users
+            return
+        _http_client_users.pop(key, None)
+        # The CLI runner keeps its pool warm across commands and closes it itself
+        # (see _close_runner); any other loop gets its connections closed here
+        if key[0] is not _runner_loop():
+            client = _http_clients.pop(key, None)
+            if client is not None:
+                await client.aclose()
+    
+    async def _post_json(self, path: str, payload: Dict[str, Any]) -> Any:
+        """POST payload as orjson-encoded bytes and return the decoded response."""
+        response = await self.client.post(path, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     async def health_check(self) -> Dict[str, Any]:
         """Check if the API is healthy."""
         response = await self.client.get("/health")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def create_plan(self, idea: str, project_id: str) -> Dict[str, Any]:
         """Create a new development plan."""
-        response = await self.client.post(
-            "/api/plan",
-            json={"idea": idea, "projectId": project_id}
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post_json("/api/plan", {"idea": idea, "projectId": project_id})
     
     async def get_plan(self, plan_id: str) -> Dict[str, Any]:
         """Get a plan by ID."""
         response = await self.client.get(f"/api/plan/{plan_id}")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
-    async def list_plans(self, project_id: str = None, user_id: str = None) -> Dict[str, Any]:
+    async def list_plans(self, project_id: Optional[str] = None, user_id: Optional[str] = None) -> Dict[str, Any]:
         """List all plans with optional filtering."""
         params = {}
         if project_id:
@@ -91,63 +245,43 @@ class BlueprinterClient:
         
         response = await self.client.get("/api/plans", params=params)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def get_storage_info(self) -> Dict[str, Any]:
         """Get storage database information."""
         response = await self.client.get("/api/storage/info")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def ask_copilot(self, plan_id: str, node_path: str, selection_text: str, user_question: str) -> Dict[str, Any]:
         """Ask the copilot for suggestions."""
-        response = await self.client.post(
-            "/api/ask",
-            json={
-                "planId": plan_id,
-                "nodePath": node_path,
-                "selectionText": selection_text,
-                "userQuestion": user_question
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post_json("/api/ask", {
+            "planId": plan_id,
+            "nodePath": node_path,
+            "selectionText": selection_text,
+            "userQuestion": user_question
+        })
     
     async def create_cursor_link(self, plan_id: str) -> Dict[str, Any]:
         """Create a Cursor deep link for a plan."""
-        response = await self.client.post(
-            "/api/cursor-link",
-            json={"planId": plan_id}
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post_json("/api/cursor-link", {"planId": plan_id})
     
     async def apply_patch(self, plan_id: str, patch: List[Dict[str, Any]], message_id: Optional[str] = None) -> Dict[str, Any]:
         """Apply a patch to a plan."""
-        response = await self.client.post(
-            "/api/plan/patch",
-            json={
-                "planId": plan_id,
-                "patch": patch,
-                "messageId": message_id
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post_json("/api/plan/patch", {
+            "planId": plan_id,
+            "patch": patch,
+            "messageId": message_id
+        })
     
     async def create_coding_preference(self, category: str, preference_text: str, context: Optional[str] = None, strength: str = "moderate") -> Dict[str, Any]:
         """Create a coding preference."""
-        response = await self.client.post(
-            "/api/coding-preferences/",
-            json={
-                "category": category,
-                "preference_text": preference_text,
-                "context": context,
-                "strength": strength
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post_json("/api/coding-preferences/", {
+            "category": category,
+            "preference_text": preference_text,
+            "context": context,
+            "strength": strength
+        })
     
     async def get_coding_preferences(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get coding preferences."""
@@ -157,48 +291,51 @@ class BlueprinterClient:
         
         response = await self.client.get("/api/coding-preferences/", params=params)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def search_similar_preferences(self, query_text: str, similarity_threshold: float = 0.7, max_results: int = 10) -> Dict[str, Any]:
         """Search for similar coding preferences."""
-        response = await self.client.post(
-            "/api/coding-preferences/search",
-            json={
-                "query_text": query_text,
-                "similarity_threshold": similarity_threshold,
-                "max_results": max_results
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post_json("/api/coding-preferences/search", {
+            "query_text": query_text,
+            "similarity_threshold": similarity_threshold,
+            "max_results": max_results
+        })
     
     async def get_coding_style_summary(self) -> List[Dict[str, Any]]:
         """Get coding style summary."""
         response = await self.client.get("/api/coding-preferences/summary")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def create_coding_signal(self, signal_type: str, signal_data: Dict[str, Any], confidence_score: float = 1.0) -> Dict[str, Any]:
         """Create a coding signal."""
-        response = await self.client.post(
-            "/api/coding-preferences/signals",
-            json={
-                "signal_type": signal_type,
-                "signal_data": signal_data,
-                "confidence_score": confidence_score
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._post_json("/api/coding-preferences/signals", {
+            "signal_type": signal_type,
+            "signal_data": signal_data,
+            "confidence_score": confidence_score
+        })
+
+
+# Resolved once; BLUEPRINTER_HOME overrides the default ~/.blueprinter
+_CONFIG_DIR = Path(os.environ.get("BLUEPRINTER_HOME") or (Path.home() / ".blueprinter"))
+_CONFIG_FILE = _CONFIG_DIR / "config.json"
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(config_file: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse the config file; keyed on (mtime, size) so edits are picked up."""
+    return orjson.loads(config_file.read_bytes())
 
 
 def load_config() -> Dict[str, Any]:
     """Load configuration from file or environment."""
-    config_file = Path.home() / ".blueprinter" / "config.json"
-    
-    if config_file.exists():
-        with open(config_file, 'r') as f:
-            return json.load(f)
+    try:
+        stat = _CONFIG_FILE.stat()
+    except FileNotFoundError:
+        stat = None
+    if stat is not None:
+        # Copy, since callers override values in place
+        return dict(_load_config_cached(_CONFIG_FILE, stat.st_mtime_ns, stat.st_size))
     
     # Default configuration
     return {
@@ -210,12 +347,102 @@ def load_config() -> Dict[str, Any]:
 
 def save_config(config: Dict[str, Any]) -> None:
     """Save configuration to file."""
-    config_dir = Path.home() / ".blueprinter"
-    config_dir.mkdir(exist_ok=True)
+    from cli.utils import atomic_write_bytes
+    
+    _CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(_CONFIG_FILE, orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    _load_config_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_runner() -> "asyncio.Runner":
+    """Return the process-wide event loop runner, using uvloop when installed.
+    
+    One loop serves every command in the process, so pooled HTTP clients
+    (keyed by loop) stay reusable between commands.
+    """
+    import asyncio
+    
+    loop_factory = None
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            pass
+    runner = asyncio.Runner(loop_factory=loop_factory)
+    atexit.register(_close_runner, runner)
+    return runner
+
+
+def _runner_loop() -> Optional["asyncio.AbstractEventLoop"]:
+    """Return the CLI runner's event loop, or None if no command has started it."""
+    if not _get_runner.cache_info().currsize:
+        return None
+    return _get_runner().get_loop()
+
+
+def _close_runner(runner: "asyncio.Runner") -> None:
+    """Close pooled HTTP clients on the runner's loop, then the loop itself."""
+    try:
+        runner.run(close_http_clients())
+    finally:
+        runner.close()
+
+
+def sync_cmd(f):
+    """Run an async click command callback on the shared event loop."""
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        return _get_runner().run(f(*args, **kwargs))
+    return wrapper
+
+
+def cli_error_handler(description: str):
+    """Report any error from an async command as description plus the error, then exit 1."""
+    def decorator(f):
+        @functools.wraps(f)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await f(*args, **kwargs)
+            except Exception as e:
+                _get_console().print(f"[red]{description}: {e}[/red]")
+                sys.exit(1)
+        return wrapper
+    return decorator
+
+
+_ELLIPSIS = "…"
+
+# Patches longer than this are cut short when printed by `copilot ask`
+MAX_DISPLAY_PATCH_OPS = 50
+
+# (header, style) columns of the preferences tables
+_PREF_TABLE_COLS = (("ID", "cyan"), ("Category", "green"), ("Strength", "yellow"), ("Text", "white"))
+_SEARCH_TABLE_COLS = (("Similarity", "green"), ("Category", "cyan"), ("Strength", "yellow"), ("Text", "white"))
+_SUMMARY_TABLE_COLS = (("Category", "cyan"), ("Preferences", "green"), ("Top Preferences", "white"))
+_PLAN_TABLE_COLS = (("ID", "cyan"), ("Project ID", "magenta"), ("User ID", "green"), ("Title", "white"), ("Created", "blue"))
+
+
+def _make_table(title: str, columns: Tuple[Tuple[str, str], ...]) -> "Table":
+    """Build a Rich table with the given (header, style) columns."""
+    from rich.table import Table
     
-    config_file = config_dir / "config.json"
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    return table
+
+
+def _preview(text: str, limit: int = 100) -> str:
+    """Truncate text to limit characters for a table cell, marking the cut."""
+    return text if len(text) <= limit else text[:limit] + _ELLIPSIS
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Write data as indented JSON in a single buffered write."""
+    with open(path, 'wb', buffering=1024 * 1024) as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
 @click.group()
@@ -238,41 +465,27 @@ def cli(ctx, base_url, api_key, verbose):
     
     ctx.obj['config'] = config
     
+    # Otherwise structlog is configured lazily by _get_logger()
     if verbose:
-        structlog.configure(
-            processors=[
-                structlog.stdlib.filter_by_level,
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
-                structlog.processors.UnicodeDecoder(),
-                structlog.dev.ConsoleRenderer()
-            ],
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
-            cache_logger_on_first_use=True,
-        )
+        _configure_logging(verbose=True)
 
 
 @cli.command()
 @click.pass_context
-def health(ctx):
+@sync_cmd
+@cli_error_handler("API health check failed")
+async def health(ctx):
     """Check API health status."""
+    from rich.panel import Panel
+    
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Checking API health...", total=None)
         
-        try:
-            result = asyncio.run(health_check_async(config["base_url"], config["api_key"]))
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.health_check()
             progress.update(task, description="✅ API is healthy")
             
             console.print(Panel(
@@ -280,16 +493,6 @@ def health(ctx):
                 title="API Health Check",
                 border_style="green"
             ))
-        except Exception as e:
-            progress.update(task, description="❌ API health check failed")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
-
-
-async def health_check_async(base_url: str, api_key: Optional[str]):
-    """Async health check function."""
-    async with BlueprinterClient(base_url, api_key) as client:
-        return await client.health_check()
 
 
 @cli.group()
@@ -305,20 +508,21 @@ def plan():
 @click.option('--copy-plan', is_flag=True, help='Copy full plan JSON to clipboard')
 @click.option('--no-clipboard', is_flag=True, help='Disable automatic clipboard copy of plan ID')
 @click.pass_context
-def create(ctx, idea, project_id, output, copy_plan, no_clipboard):
+@sync_cmd
+@cli_error_handler("Failed to create plan")
+async def create(ctx, idea, project_id, output, copy_plan, no_clipboard):
     """Create a new development plan from an idea."""
+    from rich.table import Table
+    
     config = ctx.obj['config']
+    console = _get_console()
     project_id = project_id or config.get("default_project_id", "default-project")
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Creating development plan...", total=None)
         
-        try:
-            result = asyncio.run(create_plan_async(config["base_url"], config["api_key"], idea, project_id))
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.create_plan(idea, project_id)
             progress.update(task, description="✅ Plan created successfully")
             
             plan_id = result["planId"]
@@ -342,60 +546,46 @@ def create(ctx, idea, project_id, output, copy_plan, no_clipboard):
             
             # Save to file if requested
             if output:
-                with open(output, 'w') as f:
-                    json.dump(result, f, indent=2)
+                _write_json(output, result)
                 console.print(f"[green]Plan saved to {output}[/green]")
             
             # Copy to clipboard
             try:
+                import pyperclip
+                
                 if copy_plan:
                     # Copy full plan JSON to clipboard
-                    plan_json = json.dumps(result, indent=2)
-                    pyperclip.copy(plan_json)
-                    console.print(f"[green]📋 Full plan copied to clipboard[/green]")
+                    pyperclip.copy(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+                    console.print("[green]📋 Full plan copied to clipboard[/green]")
                 elif not no_clipboard:
                     # Copy just the plan ID to clipboard by default
                     pyperclip.copy(plan_id)
-                    console.print(f"[green]📋 Plan ID copied to clipboard[/green]")
+                    console.print("[green]📋 Plan ID copied to clipboard[/green]")
             except Exception as e:
                 console.print(f"[yellow]⚠️  Could not copy to clipboard: {e}[/yellow]")
             
             console.print(f"[cyan]Plan ID: {plan_id}[/cyan]")
-            
-        except Exception as e:
-            progress.update(task, description="❌ Failed to create plan")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
-
-
-async def create_plan_async(base_url: str, api_key: Optional[str], idea: str, project_id: str):
-    """Async plan creation function."""
-    async with BlueprinterClient(base_url, api_key) as client:
-        return await client.create_plan(idea, project_id)
 
 
 @plan.command()
 @click.argument('plan_id')
 @click.option('--output', '-o', type=click.Path(), help='Output file for plan JSON')
 @click.pass_context
-def get(ctx, plan_id, output):
+@sync_cmd
+@cli_error_handler("Failed to fetch plan")
+async def get(ctx, plan_id, output):
     """Get a plan by ID."""
+    from rich.panel import Panel
+    from rich.table import Table
+    
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Fetching plan...", total=None)
         
-        try:
-            import asyncio
-            async def get_plan_async():
-                async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                    return await client.get_plan(plan_id)
-            
-            result = asyncio.run(get_plan_async())
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.get_plan(plan_id)
             progress.update(task, description="✅ Plan fetched successfully")
             
             plan_data = result["plan_json"]
@@ -430,45 +620,34 @@ def get(ctx, plan_id, output):
                 files_table.add_column("Content Preview", style="white")
                 
                 for file_data in plan_data['files']:
-                    preview = file_data['content'][:100] + "..." if len(file_data['content']) > 100 else file_data['content']
+                    preview = _preview(file_data['content'])
                     files_table.add_row(file_data['path'], preview)
                 
                 console.print(files_table)
             
             # Save to file if requested
             if output:
-                with open(output, 'w') as f:
-                    json.dump(result, f, indent=2)
+                _write_json(output, result)
                 console.print(f"[green]Plan saved to {output}[/green]")
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to fetch plan")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
 
 
-@plan.command()
+# `list` rather than the function name, which would shadow the builtin
+@plan.command(name='list')
 @click.option('--project-id', help='Filter by project ID')
 @click.option('--user-id', help='Filter by user ID')
 @click.pass_context
-def list(ctx, project_id, user_id):
+@sync_cmd
+@cli_error_handler("Failed to list plans")
+async def list_plans(ctx, project_id, user_id):
     """List all plans."""
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Fetching plans...", total=None)
         
-        try:
-            import asyncio
-            async def list_plans_async():
-                async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                    return await client.list_plans(project_id=project_id, user_id=user_id)
-            
-            result = asyncio.run(list_plans_async())
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.list_plans(project_id=project_id, user_id=user_id)
             plans = result.get("plans", [])
             
             progress.update(task, description="✅ Plans fetched successfully")
@@ -477,39 +656,29 @@ def list(ctx, project_id, user_id):
                 console.print("[yellow]No plans found[/yellow]")
                 return
             
-            # Create table
-            table = Table(title=f"Plans ({len(plans)} total)")
-            table.add_column("ID", style="cyan", no_wrap=True)
-            table.add_column("Project ID", style="magenta")
-            table.add_column("User ID", style="green")
-            table.add_column("Title", style="white")
-            table.add_column("Created", style="blue")
+            table = _make_table(f"Plans ({len(plans)} total)", _PLAN_TABLE_COLS)
             
-            for plan in plans:
-                plan_data = plan.get("plan_json", {})
+            for plan_row in plans:
+                plan_data = plan_row.get("plan_json", {})
                 table.add_row(
-                    plan["id"][:8] + "...",
-                    plan.get("project_id", "N/A"),
-                    plan.get("user_id", "N/A"),
-                    plan_data.get("title", "Untitled")[:30] + "..." if len(plan_data.get("title", "")) > 30 else plan_data.get("title", "Untitled"),
-                    plan.get("created_at", "N/A")[:10] if plan.get("created_at") else "N/A"
+                    _preview(plan_row["id"], 8),
+                    plan_row.get("project_id", "N/A"),
+                    plan_row.get("user_id", "N/A"),
+                    _preview(plan_data.get("title", "Untitled"), 30),
+                    plan_row["created_at"][:10] if plan_row.get("created_at") else "N/A"
                 )
             
             console.print(table)
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to list plans")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
 
 
 @plan.command()
 @click.argument('plan_id')
-@click.pass_context
-def copy_id(ctx, plan_id):
+def copy_id(plan_id):
     """Copy a plan ID to clipboard."""
+    console = _get_console()
     try:
         import pyperclip
+        
         pyperclip.copy(plan_id)
         console.print(f"[green]✅ Plan ID copied to clipboard:[/green] {plan_id}")
     except Exception as e:
@@ -519,25 +688,20 @@ def copy_id(ctx, plan_id):
 
 @plan.command()
 @click.pass_context
-def storage_info(ctx):
+@sync_cmd
+@cli_error_handler("Failed to get storage info")
+async def storage_info(ctx):
     """Get storage database information."""
+    from rich.panel import Panel
+    
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Getting storage info...", total=None)
         
-        try:
-            import asyncio
-            async def get_storage_info_async():
-                async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                    return await client.get_storage_info()
-            
-            info = asyncio.run(get_storage_info_async())
-            
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            info = await client.get_storage_info()
             progress.update(task, description="✅ Storage info retrieved")
             
             console.print(Panel(
@@ -549,11 +713,6 @@ def storage_info(ctx):
                 title="Storage Information",
                 border_style="green"
             ))
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to get storage info")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
 
 
 @cli.group()
@@ -568,39 +727,40 @@ def copilot():
 @click.argument('user_question')
 @click.option('--selection-text', default="", help='Selected text from the plan')
 @click.pass_context
+@sync_cmd
+@cli_error_handler("Failed to get copilot response")
 async def ask(ctx, plan_id, node_path, user_question, selection_text):
     """Ask the copilot for suggestions about a plan."""
+    from rich.json import JSON
+    from rich.panel import Panel
+    
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Asking copilot...", total=None)
         
-        try:
-            async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                result = await client.ask_copilot(plan_id, node_path, selection_text, user_question)
-                progress.update(task, description="✅ Copilot response received")
-                
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.ask_copilot(plan_id, node_path, selection_text, user_question)
+            progress.update(task, description="✅ Copilot response received")
+            
+            console.print(Panel(
+                result["rationale"],
+                title="Copilot Response",
+                border_style="green"
+            ))
+            
+            patch = result["patch"]
+            if patch:
                 console.print(Panel(
-                    result["rationale"],
-                    title="Copilot Response",
-                    border_style="green"
+                    JSON.from_data(patch[:MAX_DISPLAY_PATCH_OPS], indent=2),
+                    title="Suggested Changes (JSON Patch)",
+                    border_style="yellow"
                 ))
-                
-                if result["patch"]:
-                    console.print(Panel(
-                        JSON(json.dumps(result["patch"], indent=2)),
-                        title="Suggested Changes (JSON Patch)",
-                        border_style="yellow"
-                    ))
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to get copilot response")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
+                if len(patch) > MAX_DISPLAY_PATCH_OPS:
+                    console.print(
+                        f"[yellow]Showing {MAX_DISPLAY_PATCH_OPS} of {len(patch)} patch operations[/yellow]"
+                    )
 
 
 @cli.group()
@@ -612,35 +772,30 @@ def cursor():
 @cursor.command()
 @click.argument('plan_id')
 @click.pass_context
+@sync_cmd
+@cli_error_handler("Failed to generate Cursor link")
 async def link(ctx, plan_id):
     """Generate a Cursor deep link for a plan."""
+    from rich.panel import Panel
+    
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Generating Cursor link...", total=None)
         
-        try:
-            async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                result = await client.create_cursor_link(plan_id)
-                progress.update(task, description="✅ Cursor link generated")
-                
-                link = result["link"]
-                console.print(Panel(
-                    link,
-                    title="Cursor Deep Link",
-                    border_style="blue"
-                ))
-                
-                console.print("[yellow]Click the link above to open the plan in Cursor IDE[/yellow]")
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to generate Cursor link")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.create_cursor_link(plan_id)
+            progress.update(task, description="✅ Cursor link generated")
+            
+            link = result["link"]
+            console.print(Panel(
+                link,
+                title="Cursor Deep Link",
+                border_style="blue"
+            ))
+            
+            console.print("[yellow]Click the link above to open the plan in Cursor IDE[/yellow]")
 
 
 @cli.group()
@@ -655,80 +810,64 @@ def preferences():
 @click.option('--context', help='Additional context for the preference')
 @click.option('--strength', type=click.Choice(['weak', 'moderate', 'strong', 'absolute']), default='moderate', help='Preference strength')
 @click.pass_context
+@sync_cmd
+@cli_error_handler("Failed to add coding preference")
 async def add(ctx, category, preference_text, context, strength):
     """Add a new coding preference."""
+    from rich.panel import Panel
+    
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Adding coding preference...", total=None)
         
-        try:
-            async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                result = await client.create_coding_preference(category, preference_text, context, strength)
-                progress.update(task, description="✅ Coding preference added")
-                
-                console.print(Panel(
-                    f"ID: {result['id']}\n"
-                    f"Category: {result['category']}\n"
-                    f"Strength: {result['strength']}\n"
-                    f"Text: {result['preference_text']}",
-                    title="Coding Preference Added",
-                    border_style="green"
-                ))
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to add coding preference")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.create_coding_preference(category, preference_text, context, strength)
+            progress.update(task, description="✅ Coding preference added")
+            
+            console.print(Panel(
+                f"ID: {result['id']}\n"
+                f"Category: {result['category']}\n"
+                f"Strength: {result['strength']}\n"
+                f"Text: {result['preference_text']}",
+                title="Coding Preference Added",
+                border_style="green"
+            ))
 
 
 @preferences.command()
 @click.option('--category', help='Filter by category')
 @click.pass_context
+@sync_cmd
+@cli_error_handler("Failed to fetch coding preferences")
 async def list(ctx, category):
     """List coding preferences."""
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Fetching coding preferences...", total=None)
         
-        try:
-            async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                result = await client.get_coding_preferences(category)
-                progress.update(task, description="✅ Coding preferences fetched")
-                
-                if not result:
-                    console.print("[yellow]No coding preferences found[/yellow]")
-                    return
-                
-                table = Table(title="Coding Preferences")
-                table.add_column("ID", style="cyan")
-                table.add_column("Category", style="green")
-                table.add_column("Strength", style="yellow")
-                table.add_column("Text", style="white")
-                
-                for pref in result:
-                    table.add_row(
-                        pref['id'][:8] + "...",
-                        pref['category'],
-                        pref['strength'],
-                        pref['preference_text'][:50] + "..." if len(pref['preference_text']) > 50 else pref['preference_text']
-                    )
-                
-                console.print(table)
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to fetch coding preferences")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.get_coding_preferences(category)
+            progress.update(task, description="✅ Coding preferences fetched")
+            
+            if not result:
+                console.print("[yellow]No coding preferences found[/yellow]")
+                return
+            
+            table = _make_table("Coding Preferences", _PREF_TABLE_COLS)
+            
+            for pref in result:
+                table.add_row(
+                    _preview(pref['id'], 8),
+                    pref['category'],
+                    pref['strength'],
+                    _preview(pref['preference_text'], 50)
+                )
+            
+            console.print(table)
 
 
 @preferences.command()
@@ -736,92 +875,133 @@ async def list(ctx, category):
 @click.option('--threshold', type=float, default=0.7, help='Similarity threshold (0.0-1.0)')
 @click.option('--max-results', type=int, default=10, help='Maximum number of results')
 @click.pass_context
+@sync_cmd
+@cli_error_handler("Failed to search preferences")
 async def search(ctx, query_text, threshold, max_results):
     """Search for similar coding preferences."""
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Searching similar preferences...", total=None)
         
-        try:
-            async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                result = await client.search_similar_preferences(query_text, threshold, max_results)
-                progress.update(task, description="✅ Search completed")
-                
-                preferences = result["preferences"]
-                similarities = result["similarities"]
-                
-                if not preferences:
-                    console.print("[yellow]No similar preferences found[/yellow]")
-                    return
-                
-                table = Table(title=f"Similar Preferences for: '{query_text}'")
-                table.add_column("Similarity", style="green")
-                table.add_column("Category", style="cyan")
-                table.add_column("Strength", style="yellow")
-                table.add_column("Text", style="white")
-                
-                for pref, similarity in zip(preferences, similarities):
-                    table.add_row(
-                        f"{similarity:.2f}",
-                        pref['category'],
-                        pref['strength'],
-                        pref['preference_text'][:50] + "..." if len(pref['preference_text']) > 50 else pref['preference_text']
-                    )
-                
-                console.print(table)
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to search preferences")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.search_similar_preferences(query_text, threshold, max_results)
+            progress.update(task, description="✅ Search completed")
+            
+            preferences = result["preferences"]
+            similarities = result["similarities"]
+            
+            if not preferences:
+                console.print("[yellow]No similar preferences found[/yellow]")
+                return
+            
+            table = _make_table(f"Similar Preferences for: '{query_text}'", _SEARCH_TABLE_COLS)
+            
+            for pref, similarity in zip(preferences, similarities):
+                table.add_row(
+                    f"{similarity:.2f}",
+                    pref['category'],
+                    pref['strength'],
+                    _preview(pref['preference_text'], 50)
+                )
+            
+            console.print(table)
 
 
 @preferences.command()
 @click.pass_context
+@sync_cmd
+@cli_error_handler("Failed to generate summary")
 async def summary(ctx):
     """Get coding style summary."""
     config = ctx.obj['config']
+    console = _get_console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with _make_progress() as progress:
         task = progress.add_task("Generating coding style summary...", total=None)
         
-        try:
-            async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
-                result = await client.get_coding_style_summary()
-                progress.update(task, description="✅ Summary generated")
-                
-                if not result:
-                    console.print("[yellow]No coding style data available[/yellow]")
-                    return
-                
-                table = Table(title="Coding Style Summary")
-                table.add_column("Category", style="cyan")
-                table.add_column("Preferences", style="green")
-                table.add_column("Top Preferences", style="white")
-                
-                for summary in result:
-                    top_prefs = ", ".join(summary['top_preferences'][:3])
-                    table.add_row(
-                        summary['category'],
-                        str(summary['preference_count']),
-                        top_prefs
-                    )
-                
-                console.print(table)
-                
-        except Exception as e:
-            progress.update(task, description="❌ Failed to generate summary")
-            console.print(f"[red]Error: {e}[/red]")
-            sys.exit(1)
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            result = await client.get_coding_style_summary()
+            progress.update(task, description="✅ Summary generated")
+            
+            if not result:
+                console.print("[yellow]No coding style data available[/yellow]")
+                return
+            
+            table = _make_table("Coding Style Summary", _SUMMARY_TABLE_COLS)
+            
+            for summary in result:
+                top_prefs = ", ".join(summary['top_preferences'][:3])
+                table.add_row(
+                    summary['category'],
+                    str(summary['preference_count']),
+                    top_prefs
+                )
+            
+            console.print(table)
+
+
+@preferences.command()
+@click.option('--category', help='Filter preferences by category')
+@click.option('--query', 'query_text', help='Also search for preferences similar to this text')
+@click.pass_context
+@sync_cmd
+@cli_error_handler("Failed to load dashboard")
+async def dashboard(ctx, category, query_text):
+    """Show preferences, style summary and (optionally) a search at once."""
+    import asyncio
+    
+    from rich.console import Group
+    
+    config = ctx.obj['config']
+    console = _get_console()
+    
+    with _make_progress() as progress:
+        task = progress.add_task("Loading preferences dashboard...", total=None)
+        
+        async with BlueprinterClient(config["base_url"], config["api_key"]) as client:
+            # Independent requests; they share the pooled connection
+            requests = [
+                client.get_coding_preferences(category),
+                client.get_coding_style_summary(),
+            ]
+            if query_text:
+                requests.append(client.search_similar_preferences(query_text))
+            prefs, style_summary, *search = await asyncio.gather(*requests)
+            progress.update(task, description="✅ Dashboard loaded")
+        
+        prefs_table = _make_table("Coding Preferences", _PREF_TABLE_COLS)
+        for pref in prefs:
+            prefs_table.add_row(
+                _preview(pref['id'], 8),
+                pref['category'],
+                pref['strength'],
+                _preview(pref['preference_text'], 50)
+            )
+        
+        summary_table = _make_table("Coding Style Summary", _SUMMARY_TABLE_COLS)
+        for item in style_summary:
+            summary_table.add_row(
+                item['category'],
+                str(item['preference_count']),
+                ", ".join(item['top_preferences'][:3])
+            )
+        
+        renderables = [prefs_table, summary_table]
+        if search:
+            search_table = _make_table(f"Similar Preferences for: '{query_text}'", _SEARCH_TABLE_COLS)
+            for pref, similarity in zip(search[0]["preferences"], search[0]["similarities"]):
+                search_table.add_row(
+                    f"{similarity:.2f}",
+                    pref['category'],
+                    pref['strength'],
+                    _preview(pref['preference_text'], 50)
+                )
+            renderables.append(search_table)
+        
+        # One render pass for all tables
+        console.print(Group(*renderables))
 
 
 @cli.group()
@@ -838,6 +1018,7 @@ def config():
 def set(ctx, base_url, api_key, project_id):
     """Set configuration values."""
     config = ctx.obj['config']
+    console = _get_console()
     
     if base_url:
         config["base_url"] = base_url
@@ -854,7 +1035,10 @@ def set(ctx, base_url, api_key, project_id):
 @click.pass_context
 def show(ctx):
     """Show current configuration."""
+    from rich.table import Table
+    
     config = ctx.obj['config']
+    console = _get_console()
     
     table = Table(title="Current Configuration")
     table.add_column("Key", style="cyan")
@@ -868,6 +1052,57 @@ def show(ctx):
     console.print(table)
 
 
+@cli.command()
+@click.pass_context
+def shell(ctx):
+    """Run commands interactively in one process.
+    
+    Imports, config and the pooled API connection stay warm between
+    commands, so only the first one pays for them.
+    """
+    import shlex
+    
+    console = _get_console()
+    
+    # Carry the global options given to `blueprinter shell` into each command
+    params = ctx.parent.params
+    global_args = []
+    if params.get("base_url"):
+        global_args += ["--base-url", params["base_url"]]
+    if params.get("api_key"):
+        global_args += ["--api-key", params["api_key"]]
+    if params.get("verbose"):
+        global_args.append("--verbose")
+    
+    console.print("[cyan]Blueprinter shell - enter commands without 'blueprinter', 'exit' to quit[/cyan]")
+    while True:
+        try:
+            line = input("blueprinter> ")
+        except (EOFError, KeyboardInterrupt):
+            break
+        
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            continue
+        if not args:
+            continue
+        if args[0] in ("exit", "quit"):
+            break
+        if args[0] == "shell":
+            console.print("[yellow]Already in the shell[/yellow]")
+            continue
+        
+        try:
+            cli.main(global_args + args, prog_name="blueprinter", standalone_mode=False)
+        except click.ClickException as e:
+            e.show()
+        except (click.Abort, SystemExit):
+            # Commands report their own errors before exiting
+            pass
+
+
 def main():
     """Main entry point for the CLI."""
     cli()
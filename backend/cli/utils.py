@@ -1,48 +1,112 @@
 """Utility functions for the Blueprinter CLI."""
 
-import json
+import functools
 import os
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import click
-from rich.console import Console
-from rich.prompt import Confirm, Prompt
+import orjson
 
-console = Console()
+# click and rich are imported where they are used, so importing this module
+# for config helpers stays cheap
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+@functools.lru_cache(maxsize=1)
+def _get_console() -> "Console":
+    """Return the shared Rich console, created on first use."""
+    from rich.console import Console
+    
+    return Console()
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `utils.console` working without creating it at import time
+    if name == "console":
+        return _get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Resolved once; BLUEPRINTER_HOME overrides the default ~/.blueprinter (as in cli.main)
+_CONFIG_PATH = Path(os.environ.get("BLUEPRINTER_HOME") or (Path.home() / ".blueprinter")) / "config.json"
 
 
 def get_config_path() -> Path:
     """Get the path to the CLI configuration file."""
-    return Path.home() / ".blueprinter" / "config.json"
+    return _CONFIG_PATH
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse the config file; keyed on (mtime, size) so edits are picked up."""
+    return orjson.loads(config_path.read_bytes())
 
 
 def load_config() -> Dict[str, Any]:
     """Load CLI configuration from file."""
     config_path = get_config_path()
     
-    if not config_path.exists():
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
         return {}
     
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        console.print("[yellow]Warning: Invalid configuration file, using defaults[/yellow]")
+        # Copy, since callers update the config in place
+        return dict(_load_config_cached(config_path, stat.st_mtime_ns, stat.st_size))
+    except (orjson.JSONDecodeError, IOError):
+        _get_console().print("[yellow]Warning: Invalid configuration file, using defaults[/yellow]")
         return {}
 
 
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data next to path, then rename it over path so readers never see a partial file.
+    
+    Each writer gets its own temporary file, so concurrent saves cannot
+    clobber each other's data; a failed write removes its temporary file.
+    """
+    import tempfile
+    
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+    ) as tmp:
+        tmp_path = tmp.name
+        try:
+            tmp.write(data)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp_path)
+            raise
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def save_config(config: Dict[str, Any]) -> None:
     """Save CLI configuration to file."""
     config_path = get_config_path()
-    config_path.parent.mkdir(parents=True, exist_ok=True)
+    data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
     
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+    # Leave an identical file alone, keeping its mtime and the load cache valid
+    try:
+        if config_path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    atomic_write_bytes(config_path, data)
+    _load_config_cached.cache_clear()
 
 
 def interactive_setup() -> Dict[str, Any]:
     """Interactive setup for CLI configuration."""
+    from rich.prompt import Prompt
+    
+    console = _get_console()
     console.print("[bold blue]Blueprinter CLI Setup[/bold blue]")
     console.print("Let's configure your CLI settings.\n")
     
@@ -94,7 +158,7 @@ def interactive_setup() -> Dict[str, Any]:
 def format_plan_output(plan_data: Dict[str, Any], format_type: str = "table") -> str:
     """Format plan data for display."""
     if format_type == "json":
-        return json.dumps(plan_data, indent=2)
+        return orjson.dumps(plan_data, option=orjson.OPT_INDENT_2).decode()
     
     # Default table format
     output = []
@@ -113,19 +177,23 @@ def validate_plan_id(plan_id: str) -> bool:
     return len(plan_id) > 10 and "-" in plan_id
 
 
+_PROJECT_MARKERS = frozenset({
+    "package.json", "pyproject.toml", "Cargo.toml", "go.mod", "requirements.txt", ".git"
+})
+
+
 def get_project_id_from_cwd() -> Optional[str]:
     """Try to determine project ID from current working directory."""
     cwd = Path.cwd()
     
-    # Look for common project files
-    project_files = ["package.json", "pyproject.toml", "Cargo.toml", "go.mod", "requirements.txt"]
-    
-    for file_name in project_files:
-        if (cwd / file_name).exists():
-            return cwd.name
+    # Look for common project files or a git repository in one directory scan
+    try:
+        with os.scandir(cwd) as entries:
+            names = {entry.name for entry in entries}
+    except OSError:
+        return None
     
-    # Look for git repository
-    if (cwd / ".git").exists():
+    if names & _PROJECT_MARKERS:
         return cwd.name
     
     return None
@@ -133,6 +201,8 @@ def get_project_id_from_cwd() -> Optional[str]:
 
 def confirm_action(message: str, default: bool = True) -> bool:
     """Ask for user confirmation."""
+    from rich.prompt import Confirm
+    
     return Confirm.ask(message, default=default)
 
 
@@ -144,43 +214,47 @@ def select_from_list(items: List[str], prompt: str = "Select an item") -> Option
     if len(items) == 1:
         return items[0]
     
+    from rich.prompt import Prompt
+    
+    console = _get_console()
     console.print(f"\n{prompt}:")
     for i, item in enumerate(items, 1):
         console.print(f"  {i}. {item}")
     
-    while True:
-        try:
-            choice = Prompt.ask("Enter your choice (number)", default="1")
-            index = int(choice) - 1
-            if 0 <= index < len(items):
-                return items[index]
-            else:
-                console.print("[red]Invalid choice. Please try again.[/red]")
-        except ValueError:
-            console.print("[red]Please enter a valid number.[/red]")
+    # Rich validates against the choices and re-asks on invalid input
+    choice = Prompt.ask(
+        "Enter your choice (number)",
+        choices=[str(i) for i in range(1, len(items) + 1)],
+        default="1",
+        show_choices=False
+    )
+    return items[int(choice) - 1]
 
 
 def display_error(error: Exception, context: str = "") -> None:
     """Display an error message with context."""
     if context:
-        console.print(f"[red]Error in {context}: {error}[/red]")
+        _get_console().print(f"[red]Error in {context}: {error}[/red]")
     else:
-        console.print(f"[red]Error: {error}[/red]")
+        _get_console().print(f"[red]Error: {error}[/red]")
 
 
 def display_success(message: str) -> None:
     """Display a success message."""
-    console.print(f"[green]✅ {message}[/green]")
+    _get_console().print(f"[green]✅ {message}[/green]")
 
 
 def display_warning(message: str) -> None:
     """Display a warning message."""
-    console.print(f"[yellow]⚠️  {message}[/yellow]")
+    _get_console().print(f"[yellow]⚠️  {message}[/yellow]")
 
 
 def display_info(message: str) -> None:
     """Display an info message."""
-    console.print(f"[blue]ℹ️  {message}[/blue]")
+    _get_console().print(f"[blue]ℹ️  {message}[/blue]")
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -188,13 +262,10 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if size_bytes >= 1024 else 0
     
-    return f"{size_bytes:.1f} {size_names[i]}"
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
 def truncate_text(text: str, max_length: int = 50, suffix: str = "...") -> str:
@@ -207,20 +278,22 @@ def truncate_text(text: str, max_length: int = 50, suffix: str = "...") -> str:
 
 def parse_json_file(file_path: str) -> Dict[str, Any]:
     """Parse a JSON file and return its contents."""
+    import click
+    
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        return orjson.loads(Path(file_path).read_bytes())
     except FileNotFoundError:
         raise click.ClickException(f"File not found: {file_path}")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise click.ClickException(f"Invalid JSON in {file_path}: {e}")
 
 
 def write_json_file(file_path: str, data: Dict[str, Any]) -> None:
     """Write data to a JSON file."""
+    import click
+    
     try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        atomic_write_bytes(Path(file_path), orjson.dumps(data, option=orjson.OPT_INDENT_2))
     except IOError as e:
         raise click.ClickException(f"Failed to write to {file_path}: {e}")
 
@@ -246,30 +319,16 @@ def get_environment_variables() -> Dict[str, str]:
 
 def check_dependencies() -> List[str]:
     """Check if required dependencies are available."""
-    missing = []
-    
-    try:
-        import httpx
-    except ImportError:
-        missing.append("httpx")
-    
-    try:
-        import click
-    except ImportError:
-        missing.append("click")
-    
-    try:
-        import rich
-    except ImportError:
-        missing.append("rich")
-    
-    return missing
+    # find_spec only locates the modules; nothing is imported. orjson is left
+    # out because importing this module already requires it.
+    return [name for name in ("httpx", "click", "rich") if find_spec(name) is None]
 
 
 def get_version() -> str:
     """Get the CLI version."""
+    from importlib.metadata import PackageNotFoundError, version
+    
     try:
-        import pkg_resources
-        return pkg_resources.get_distribution("blueprinter-backend").version
-    except Exception:
+        return version("blueprinter-backend")
+    except PackageNotFoundError:
         return "unknown"
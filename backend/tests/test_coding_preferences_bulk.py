@@ -0,0 +1,94 @@
+"""Tests for the bulk coding preference and signal endpoints."""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_current_user, get_supabase
+from app.api.routes import coding_preferences
+from app.openai_client import get_openai_client
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+class FakeTable:
+    def __init__(self, inserts):
+        self._inserts = inserts
+        self._rows = []
+
+    def insert(self, rows):
+        self._inserts.append(rows)
+        self._rows = [
+            {
+                **row,
+                "id": f"pref-{i}",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+            }
+            for i, row in enumerate(rows)
+        ]
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self._rows)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.inserts = []
+
+    def table(self, name):
+        return FakeTable(self.inserts)
+
+
+@pytest.fixture
+def supabase():
+    return FakeSupabase()
+
+
+@pytest.fixture
+def client(supabase):
+    app = FastAPI()
+    app.include_router(coding_preferences.router)
+    app.dependency_overrides[get_supabase] = lambda: supabase
+    app.dependency_overrides[get_current_user] = lambda: {"id": USER_ID}
+    app.dependency_overrides[get_openai_client] = lambda: None
+    return TestClient(app)
+
+
+def _preferences(count):
+    return [
+        {"category": "code_style", "preference_text": f"Preference {i}", "strength": "strong"}
+        for i in range(count)
+    ]
+
+
+def _signals(count):
+    return [{"signal_type": "file_created", "signal_data": {"index": i}} for i in range(count)]
+
+
+def test_bulk_preferences_insert_in_one_call(client, supabase):
+    response = client.post("/coding-preferences/bulk", json={"items": _preferences(100)})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 100
+    assert len(supabase.inserts) == 1
+    assert {row["user_id"] for row in supabase.inserts[0]} == {USER_ID}
+
+
+@pytest.mark.parametrize("count", [0, 101])
+def test_bulk_preferences_enforce_item_limits(client, supabase, count):
+    response = client.post("/coding-preferences/bulk", json={"items": _preferences(count)})
+
+    assert response.status_code == 422
+    assert supabase.inserts == []
+
+
+@pytest.mark.parametrize("count", [0, 101])
+def test_bulk_signals_enforce_item_limits(client, supabase, count):
+    response = client.post("/coding-preferences/signals/bulk", json={"items": _signals(count)})
+
+    assert response.status_code == 422
+    assert supabase.inserts == []
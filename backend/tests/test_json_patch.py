@@ -0,0 +1,127 @@
+"""Tests for the copy-on-write JSON Patch implementation."""
+
+import copy
+
+import jsonpatch
+import pytest
+from jsonpatch import InvalidJsonPatch, JsonPatchConflict, JsonPatchTestFailed
+from jsonpointer import JsonPointerException
+
+from app.utils.json_patch import apply_patch, preview_patch, validate_patch_operations
+
+
+@pytest.fixture
+def plan():
+    return {
+        "title": "Todo app",
+        "steps": [
+            {"kind": "code", "target": "api/todos.py", "summary": "Add CRUD routes"},
+            {"kind": "test", "target": "tests/test_todos.py", "summary": "Cover routes"},
+        ],
+        "files": [
+            {"path": "api/todos.py", "content": "router = APIRouter()"},
+            {"path": "README.md", "content": "# Todo"},
+        ],
+        "risks": ["Data loss", "Auth bypass"],
+        "tests": ["Create todo", "Delete todo"],
+        "prBody": "## Todo app",
+    }
+
+
+# Every patch here is allowed by ALLOWED_PATHS, so results must match jsonpatch.
+# Error parity is covered separately by test_apply_patch_errors_match_jsonpatch.
+PARITY_PATCHES = [
+    [{"op": "replace", "path": "/title", "value": "Todo service"}],
+    [{"op": "replace", "path": "/prBody", "value": "## Updated"}],
+    [{"op": "add", "path": "/steps/1", "value": {"kind": "config", "target": "cfg", "summary": "Env"}}],
+    [{"op": "add", "path": "/steps/-", "value": {"kind": "test", "target": "e2e", "summary": "E2E"}}],
+    [{"op": "replace", "path": "/steps/0/summary", "value": "Add list route"}],
+    [{"op": "remove", "path": "/risks/0"}],
+    [{"op": "replace", "path": "/files/1/content", "value": "# Todo\n\nUsage"}],
+    [{"op": "move", "from": "/tests/0", "path": "/tests/1"}],
+    [{"op": "copy", "from": "/risks/0", "path": "/risks/-"}],
+    [{"op": "test", "path": "/prBody", "value": "## Todo app"}],
+    [
+        {"op": "test", "path": "/title", "value": "Todo app"},
+        {"op": "replace", "path": "/title", "value": "Todo v2"},
+        {"op": "remove", "path": "/steps/1"},
+        {"op": "add", "path": "/tests/0", "value": "List todos"},
+        {"op": "replace", "path": "/files/0/content", "value": ""},
+    ],
+]
+
+
+@pytest.mark.parametrize("patch", PARITY_PATCHES)
+def test_apply_patch_matches_jsonpatch(plan, patch):
+    original = copy.deepcopy(plan)
+
+    assert apply_patch(plan, patch) == jsonpatch.apply_patch(original, patch)
+    # Copy-on-write: the input document is never mutated
+    assert plan == original
+
+
+def test_preview_patch_leaves_plan_untouched(plan):
+    original = copy.deepcopy(plan)
+    patch = [{"op": "replace", "path": "/steps/0/kind", "value": "test"}]
+
+    preview = preview_patch(plan, patch)
+
+    assert preview["steps"][0]["kind"] == "test"
+    assert plan == original
+
+
+def test_patched_values_are_not_aliased(plan):
+    value = {"kind": "code", "target": "x", "summary": "y"}
+
+    patched = apply_patch(plan, [{"op": "add", "path": "/steps/-", "value": value}])
+    value["summary"] = "mutated"
+
+    assert patched["steps"][-1]["summary"] == "y"
+
+
+@pytest.mark.parametrize(
+    ("patch", "error"),
+    [
+        ([{"op": "replace", "path": "/steps/5", "value": {}}], JsonPatchConflict),
+        ([{"op": "remove", "path": "/risks/9"}], JsonPatchConflict),
+        ([{"op": "test", "path": "/title", "value": "Other"}], JsonPatchTestFailed),
+        ([{"op": "test", "path": "/steps/5", "value": {}}], JsonPatchTestFailed),
+        ([{"op": "test", "path": "/steps/0/owner", "value": "x"}], JsonPatchTestFailed),
+        ([{"op": "move", "from": "/tests/5", "path": "/tests/0"}], JsonPatchConflict),
+        ([{"op": "copy", "from": "/risks/9", "path": "/risks/-"}], JsonPatchConflict),
+        ([{"op": "copy", "from": "/steps/0/owner", "path": "/risks/-"}], JsonPatchConflict),
+        ([{"op": "move", "from": "/tests/01", "path": "/tests/0"}], JsonPointerException),
+        ([{"op": "replace", "path": "/steps/01", "value": {}}], JsonPointerException),
+        ([{"op": "replace", "path": "/title"}], InvalidJsonPatch),
+    ],
+)
+def test_apply_patch_errors_match_jsonpatch(plan, patch, error):
+    with pytest.raises(error):
+        jsonpatch.apply_patch(copy.deepcopy(plan), patch)
+    with pytest.raises(error):
+        apply_patch(plan, patch)
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        [{"op": "replace", "path": "/owner", "value": "x"}],
+        [{"op": "replace", "path": "/files/0/path", "value": "../etc/passwd"}],
+        [{"op": "copy", "from": "/owner", "path": "/risks/-"}],
+        [{"op": "frobnicate", "path": "/title", "value": "x"}],
+        [{"op": "replace", "value": "x"}],
+    ],
+)
+def test_disallowed_patches_are_rejected(plan, patch):
+    assert not validate_patch_operations(patch)
+    with pytest.raises(ValueError, match="Invalid patch operations"):
+        apply_patch(plan, patch)
+
+
+def test_validation_ignores_values_for_cached_shapes(plan):
+    first = [{"op": "replace", "path": "/title", "value": "A"}]
+    second = [{"op": "replace", "path": "/title", "value": "B"}]
+
+    assert validate_patch_operations(first)
+    assert validate_patch_operations(second)
+    assert apply_patch(plan, second)["title"] == "B"
@@ -0,0 +1,94 @@
+"""Tests for storing learned patterns in preference_patterns."""
+
+from types import SimpleNamespace
+
+import pytest
+from postgrest.exceptions import APIError
+
+from app.services.pattern_learning_service import PatternLearningService
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+class FakeQuery:
+    def __init__(self, table, action, payload=None):
+        self._table = table
+        self._action = action
+        self._payload = payload
+        self._filters = {}
+
+    def eq(self, column, value):
+        self._filters[column] = value
+        return self
+
+    def in_(self, column, values):
+        self._filters[column] = list(values)
+        return self
+
+    def execute(self):
+        self._table.calls.append((self._action, self._payload, self._filters))
+        if self._action == "upsert" and self._table.upsert_error:
+            raise self._table.upsert_error
+        if self._action == "select":
+            return SimpleNamespace(data=self._table.existing)
+        return SimpleNamespace(data=[])
+
+
+class FakeTable:
+    def __init__(self, upsert_error=None, existing=()):
+        self.upsert_error = upsert_error
+        self.existing = list(existing)
+        self.calls = []
+
+    def upsert(self, rows, on_conflict):
+        return FakeQuery(self, "upsert", rows)
+
+    def select(self, columns):
+        return FakeQuery(self, "select")
+
+    def update(self, row):
+        return FakeQuery(self, "update", row)
+
+    def insert(self, rows):
+        return FakeQuery(self, "insert", rows)
+
+
+def _service(table):
+    return PatternLearningService(SimpleNamespace(table=lambda name: table), None)
+
+
+def _rows(*names):
+    return [{"user_id": USER_ID, "pattern_name": name, "confidence_score": 0.5} for name in names]
+
+
+def test_patterns_are_written_with_one_upsert():
+    table = FakeTable()
+
+    _service(table)._write_learned_patterns(_rows("a", "b"))
+
+    assert [action for action, _, _ in table.calls] == ["upsert"]
+
+
+def test_missing_unique_index_falls_back_to_update_and_insert():
+    table = FakeTable(
+        upsert_error=APIError({"code": "42P10", "message": "no unique or exclusion constraint"}),
+        existing=[{"id": "pat-1", "pattern_name": "a"}],
+    )
+
+    _service(table)._write_learned_patterns(_rows("a", "b"))
+
+    assert [action for action, _, _ in table.calls] == ["upsert", "select", "update", "insert"]
+    _, _, select_filters = table.calls[1]
+    assert select_filters == {"user_id": USER_ID, "pattern_name": ["a", "b"]}
+    _, updated, update_filters = table.calls[2]
+    assert updated["pattern_name"] == "a" and update_filters == {"id": "pat-1"}
+    _, inserted, _ = table.calls[3]
+    assert [row["pattern_name"] for row in inserted] == ["b"]
+
+
+def test_other_upsert_errors_are_raised():
+    table = FakeTable(upsert_error=APIError({"code": "23502", "message": "null value"}))
+
+    with pytest.raises(APIError):
+        _service(table)._write_learned_patterns(_rows("a"))
+    assert [action for action, _, _ in table.calls] == ["upsert"]
@@ -0,0 +1,82 @@
+"""Tests for the NDJSON plan streaming endpoint."""
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import plan as plan_routes
+from app.models import PlanEvent
+
+PLAN = {
+    "title": "Todo app",
+    "steps": [{"kind": "code", "target": "api.py", "summary": "Add routes"}],
+    "files": [{"path": "api.py", "content": "app = FastAPI()"}],
+    "risks": ["Data loss"],
+    "tests": ["Create todo"],
+    "prBody": "## Todo app",
+}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(plan_routes.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def saved_plans(monkeypatch):
+    saved = []
+
+    async def create_plan(project_id, user_id, plan_json):
+        saved.append(plan_json)
+        return "plan-1"
+
+    monkeypatch.setattr(plan_routes.local_storage, "create_plan", create_plan)
+    return saved
+
+
+def _events(response):
+    return [orjson.loads(line) for line in response.iter_lines() if line]
+
+
+def test_stream_emits_steps_then_saved_plan(client, saved_plans, monkeypatch):
+    async def generate_plan_stream(idea, project_id, user_id):
+        for step in PLAN["steps"]:
+            yield PlanEvent(type="step", data=step)
+        yield PlanEvent(type="plan", data=PLAN)
+
+    monkeypatch.setattr(plan_routes, "generate_plan_stream", generate_plan_stream)
+
+    with client.stream("POST", "/plan/stream", json={"idea": "Todo app", "projectId": "p1"}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = _events(response)
+
+    assert [event["type"] for event in events] == ["step", "plan"]
+    assert events[0]["data"] == PLAN["steps"][0]
+    assert events[1]["data"] == PLAN
+    assert events[1]["planId"] == "plan-1"
+    assert saved_plans == [PLAN]
+
+
+def test_stream_reports_failures_in_band(client, saved_plans, monkeypatch):
+    async def generate_plan_stream(idea, project_id, user_id):
+        yield PlanEvent(type="step", data=PLAN["steps"][0])
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(plan_routes, "generate_plan_stream", generate_plan_stream)
+
+    with client.stream("POST", "/plan/stream", json={"idea": "Todo app", "projectId": "p1"}) as response:
+        events = _events(response)
+
+    assert [event["type"] for event in events] == ["step", "error"]
+    assert "model unavailable" in events[1]["data"]["detail"]
+    assert saved_plans == []
+
+
+def test_stream_rejects_empty_idea(client):
+    response = client.post("/plan/stream", json={"idea": "   ", "projectId": "p1"})
+
+    assert response.status_code == 400
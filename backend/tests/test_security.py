@@ -0,0 +1,112 @@
+"""Tests for HMAC signing of payloads and Cursor deep links."""
+
+import base64
+import hashlib
+import hmac
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app import security
+from app.security import (
+    create_cursor_link,
+    decode_cursor_payload,
+    sign_payload,
+    sign_payload_raw,
+    verify_signature,
+)
+
+
+@pytest.fixture(autouse=True)
+def hmac_secret(monkeypatch):
+    monkeypatch.setenv("HMAC_SECRET", "test-secret")
+    security._hmac_template.cache_clear()
+    yield
+    security._hmac_template.cache_clear()
+
+
+@pytest.fixture
+def payload():
+    return {
+        "version": 1,
+        "projectHint": "todo",
+        "plan": {"title": "Todo app", "prBody": "## Todo ✓"},
+        "files": [{"path": "README.md", "content": "# Todo\n"}],
+        "postActions": None,
+    }
+
+
+def _link_params(link):
+    query = parse_qs(urlsplit(link).query)
+    return query["data"][0], query["sig"][0]
+
+
+def test_cursor_link_round_trip(payload):
+    link = create_cursor_link(payload)
+    data, sig = _link_params(link)
+
+    assert link.startswith("vscode://subhrato.blueprint-snap/ingest?")
+    assert "=" not in data and "=" not in sig
+    assert decode_cursor_payload(data, sig) == payload
+
+
+def test_cursor_link_accepts_padded_signature(payload):
+    data, sig = _link_params(create_cursor_link(payload))
+
+    assert decode_cursor_payload(data, sig + "=") == payload
+
+
+def test_signature_covers_the_encoded_body(payload):
+    data, sig = _link_params(create_cursor_link(payload))
+
+    assert sig == sign_payload_raw(data)
+
+
+def test_tampered_data_is_rejected(payload):
+    data, sig = _link_params(create_cursor_link(payload))
+    tampered = data[:-1] + ("A" if data[-1] != "A" else "B")
+
+    with pytest.raises(ValueError, match="Invalid signature"):
+        decode_cursor_payload(tampered, sig)
+
+
+def test_tampered_signature_is_rejected(payload):
+    data, sig = _link_params(create_cursor_link(payload))
+    tampered = ("A" if sig[0] != "A" else "B") + sig[1:]
+
+    with pytest.raises(ValueError, match="Invalid signature"):
+        decode_cursor_payload(data, tampered)
+
+
+def test_link_signed_with_another_secret_is_rejected(payload, monkeypatch):
+    data, sig = _link_params(create_cursor_link(payload))
+
+    monkeypatch.setenv("HMAC_SECRET", "rotated-secret")
+    security._hmac_template.cache_clear()
+
+    with pytest.raises(ValueError, match="Invalid signature"):
+        decode_cursor_payload(data, sig)
+
+
+def test_payload_signature_round_trip(payload):
+    signature = sign_payload(payload)
+
+    assert verify_signature(payload, signature)
+    # Canonical form: key order does not change the signature
+    assert verify_signature(dict(reversed(list(payload.items()))), signature)
+
+
+def test_payload_signature_rejects_tampering(payload):
+    signature = sign_payload(payload)
+
+    assert not verify_signature({**payload, "projectHint": "other"}, signature)
+    assert not verify_signature(payload, signature[:-1])
+
+
+def test_payload_signature_uses_ascii_escaped_canonical_json():
+    payload = {"title": "Todo ✓", "version": 1}
+    canonical = b'{"title":"Todo \\u2713","version":1}'
+    expected = hmac.new(b"test-secret", canonical, hashlib.sha256).digest()
+
+    assert security._canonical(payload) == canonical
+    assert sign_payload(payload) == base64.urlsafe_b64encode(expected).rstrip(b"=").decode()
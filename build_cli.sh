@@ -0,0 +1,57 @@
+#!/bin/bash
+
+# Blueprint Snap CLI Builder
+# Packages the CLI as a single self-contained file in dist/
+#
+# Usage: ./build_cli.sh          # shiv zipapp (dist/blueprinter.pyz)
+#        ./build_cli.sh --native # Nuitka onefile binary (dist/blueprinter)
+
+set -e
+
+echo "📦 Building Blueprinter CLI"
+echo "=========================="
+
+# Check if we're in the right directory
+if [ ! -d "backend/cli" ]; then
+    echo "❌ backend/cli directory not found. Please run from project root."
+    exit 1
+fi
+
+# Check if Python is available
+if ! command -v python3 &> /dev/null; then
+    echo "❌ Python 3 is not installed"
+    exit 1
+fi
+
+mkdir -p dist
+
+if [ "$1" == "--native" ]; then
+    echo "🔧 Compiling with Nuitka..."
+    python3 -m pip install --quiet nuitka
+    # rich, httpx, structlog and pyperclip are imported lazily, so name them explicitly
+    # The cli package lives in backend/
+    PYTHONPATH=backend python3 -m nuitka --onefile \
+        --include-package=cli \
+        --include-package=rich \
+        --include-package=httpx \
+        --include-package=structlog \
+        --include-package=pyperclip \
+        --output-dir=build/nuitka \
+        --output-filename=blueprinter \
+        backend/cli/main.py
+    mv build/nuitka/blueprinter dist/blueprinter
+    echo "✅ Built dist/blueprinter"
+else
+    echo "🔧 Bundling with shiv..."
+    python3 -m pip install --quiet shiv
+    rm -rf build/shiv
+    mkdir -p build/shiv
+    cp -r backend/cli build/shiv/cli
+    find build/shiv -name "__pycache__" -prune -exec rm -rf {} +
+    python3 -m shiv \
+        --site-packages build/shiv \
+        -e cli.main:main \
+        -o dist/blueprinter.pyz \
+        click rich "httpx[http2]" orjson structlog pyperclip
+    echo "✅ Built dist/blueprinter.pyz"
+fi
@@ -1 +0,0 @@
-"""Blueprinter CLI package."""
@@ -81,18 +81,10 @@ async function decodeAndVerifyPayload(data: string, signature: string): Promise<
       throw new Error('HMAC secret not configured. Please set blueprintSnap.secret in settings.');
     }
 
-    // Add padding if needed
-    const paddedData = data + '='.repeat((4 - data.length % 4) % 4);
-    
-    // Decode base64url
-    const payloadJson = Buffer.from(paddedData, 'base64url').toString('utf-8');
-    const payload: CursorPayload = JSON.parse(payloadJson);
-
-    // Verify signature using the same format as backend (sorted keys, compact separators)
-    const normalizedJson = JSON.stringify(payload, Object.keys(payload).sort());
+    // Verify signature over the base64url body exactly as received
     const expectedSignature = crypto
       .createHmac('sha256', secret)
-      .update(normalizedJson)
+      .update(data, 'ascii')
       .digest('base64url')
       .replace(/=/g, '');
 
@@ -107,6 +99,13 @@ async function decodeAndVerifyPayload(data: string, signature: string): Promise<
       throw new Error('Invalid signature');
     }
 
+    // Add padding if needed
+    const paddedData = data + '='.repeat((4 - data.length % 4) % 4);
+    
+    // Decode base64url
+    const payloadJson = Buffer.from(paddedData, 'base64url').toString('utf-8');
+    const payload: CursorPayload = JSON.parse(payloadJson);
+
     return payload;
   } catch (error) {
     throw new Error(`Failed to decode payload: ${error.message}`);
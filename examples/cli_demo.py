@@ -6,11 +6,11 @@ import json
 import time
 from pathlib import Path
 
-# Add the CLI module to the path
+# Add the CLI module (shipped in the backend package) to the path
 import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
-from cli.main import BlueprinterClient
+from cli.main import BlueprinterClient, _get_runner
 
 
 async def demo_cli_usage():
@@ -95,39 +95,44 @@ async def demo_cli_usage():
         except Exception as e:
             print(f"❌ Failed to add coding preference: {e}")
         
+        # 7-9 are independent reads, so send them together
+        preferences, search_results, summary = await asyncio.gather(
+            client.get_coding_preferences(),
+            client.search_similar_preferences(
+                "React TypeScript components",
+                similarity_threshold=0.5,
+                max_results=3
+            ),
+            client.get_coding_style_summary(),
+            return_exceptions=True
+        )
+        
         # 7. List Preferences
         print("\n7. Listing coding preferences...")
-        try:
-            preferences = await client.get_coding_preferences()
+        if isinstance(preferences, Exception):
+            print(f"❌ Failed to list preferences: {preferences}")
+        else:
             print(f"✅ Found {len(preferences)} coding preferences")
             for pref in preferences[:3]:  # Show first 3
                 print(f"   - {pref['category']}: {pref['preference_text'][:50]}...")
-        except Exception as e:
-            print(f"❌ Failed to list preferences: {e}")
         
         # 8. Search Similar Preferences
         print("\n8. Searching for similar preferences...")
-        try:
-            search_results = await client.search_similar_preferences(
-                "React TypeScript components",
-                similarity_threshold=0.5,
-                max_results=3
-            )
+        if isinstance(search_results, Exception):
+            print(f"❌ Failed to search preferences: {search_results}")
+        else:
             print(f"✅ Found {len(search_results['preferences'])} similar preferences")
             for pref, similarity in zip(search_results['preferences'], search_results['similarities']):
                 print(f"   - Similarity: {similarity:.2f} - {pref['preference_text'][:50]}...")
-        except Exception as e:
-            print(f"❌ Failed to search preferences: {e}")
         
         # 9. Get Style Summary
         print("\n9. Getting coding style summary...")
-        try:
-            summary = await client.get_coding_style_summary()
+        if isinstance(summary, Exception):
+            print(f"❌ Failed to get style summary: {summary}")
+        else:
             print(f"✅ Style summary generated")
             for item in summary:
                 print(f"   - {item['category']}: {item['preference_count']} preferences")
-        except Exception as e:
-            print(f"❌ Failed to get style summary: {e}")
         
         # 10. Create Coding Signal
         print("\n10. Creating coding signal...")
@@ -170,9 +175,8 @@ def demo_configuration():
     save_config(config)
     print("✅ Configuration updated")
     
-    # Reload and show
-    new_config = load_config()
-    print(f"Updated config: {json.dumps(new_config, indent=2)}")
+    # The saved dict is what's on disk now; no need to read it back
+    print(f"Updated config: {json.dumps(config, indent=2)}")
 
 
 if __name__ == "__main__":
@@ -185,7 +189,7 @@ if __name__ == "__main__":
         # Run configuration demo
         demo_configuration()
         
-        # Run async demo
-        asyncio.run(demo_cli_usage())
+        # Run async demo on the CLI's runner (uvloop when installed)
+        _get_runner().run(demo_cli_usage())
     else:
         print("Demo cancelled.")
@@ -10,27 +10,41 @@ This script demonstrates:
 """
 
 import asyncio
-import json
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 import httpx
-from supabase import create_client, Client
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 # Configuration
 SUPABASE_URL = "your-supabase-url"
 SUPABASE_KEY = "your-supabase-anon-key"
 API_BASE_URL = "http://localhost:8000/api"
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def get_supabase() -> "Client":
+    """Create the Supabase client; supabase is only imported when the demo runs."""
+    from supabase import create_client
+    
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
 class CodingPreferencesDemo:
     """Demo class for the coding preferences system."""
     
-    def __init__(self, api_base_url: str, supabase_client: Client):
+    def __init__(self, api_base_url: str, supabase_client: "Client"):
         self.api_base_url = api_base_url
         self.supabase = supabase_client
         self.auth_token = None
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def __aenter__(self) -> "CodingPreferencesDemo":
+        # One client for the whole demo, so every request reuses its connections
+        self._client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self._client.aclose()
     
     async def authenticate(self, email: str, password: str) -> bool:
         """Authenticate with Supabase."""
@@ -94,61 +108,80 @@ class CodingPreferencesDemo:
             }
         ]
         
-        async with httpx.AsyncClient() as client:
-            for pref in preferences:
-                try:
-                    response = await client.post(
-                        f"{self.api_base_url}/coding-preferences/",
-                        headers={
-                            "Authorization": f"Bearer {self.auth_token}",
-                            "Content-Type": "application/json"
-                        },
-                        json=pref
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        print(f"  ✅ Added: {pref['preference_text']}")
-                    else:
-                        print(f"  ❌ Failed to add: {pref['preference_text']} - {response.text}")
-                        
-                except Exception as e:
-                    print(f"  ❌ Error adding preference: {e}")
+        # One request for the whole batch; older servers lack /bulk
+        try:
+            response = await self._client.post(
+                f"{self.api_base_url}/coding-preferences/bulk",
+                headers={
+                    "Authorization": f"Bearer {self.auth_token}",
+                    "Content-Type": "application/json"
+                },
+                json={"items": preferences}
+            )
+            
+            if response.status_code == 200:
+                for pref in preferences:
+                    print(f"  ✅ Added: {pref['preference_text']}")
+                return
+            elif response.status_code != 404:
+                print(f"  ❌ Failed to add preferences: {response.text}")
+                return
+                
+        except Exception as e:
+            print(f"  ❌ Error adding preferences: {e}")
+            return
+        
+        # Fall back to one POST per preference, sent concurrently
+        headers = {
+            "Authorization": f"Bearer {self.auth_token}",
+            "Content-Type": "application/json"
+        }
+        responses = await asyncio.gather(*[
+            self._client.post(f"{self.api_base_url}/coding-preferences/", headers=headers, json=pref)
+            for pref in preferences
+        ], return_exceptions=True)
+        
+        for pref, response in zip(preferences, responses):
+            if isinstance(response, Exception):
+                print(f"  ❌ Error adding preference: {response}")
+            elif response.status_code == 200:
+                print(f"  ✅ Added: {pref['preference_text']}")
+            else:
+                print(f"  ❌ Failed to add: {pref['preference_text']} - {response.text}")
     
     async def search_similar_preferences(self, query: str) -> List[Dict[str, Any]]:
         """Search for similar preferences using vector similarity."""
         print(f"\n🔍 Searching for preferences similar to: '{query}'")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.api_base_url}/coding-preferences/search",
-                    headers={
-                        "Authorization": f"Bearer {self.auth_token}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "query_text": query,
-                        "similarity_threshold": 0.7,
-                        "max_results": 5
-                    }
-                )
+        try:
+            response = await self._client.post(
+                f"{self.api_base_url}/coding-preferences/search",
+                headers={
+                    "Authorization": f"Bearer {self.auth_token}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "query_text": query,
+                    "similarity_threshold": 0.7,
+                    "max_results": 5
+                }
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                print(f"  Found {len(result['preferences'])} similar preferences:")
+                
+                for i, (pref, similarity) in enumerate(zip(result['preferences'], result['similarities'])):
+                    print(f"    {i+1}. {pref['preference_text']} (similarity: {similarity:.3f})")
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    print(f"  Found {len(result['preferences'])} similar preferences:")
-                    
-                    for i, (pref, similarity) in enumerate(zip(result['preferences'], result['similarities'])):
-                        print(f"    {i+1}. {pref['preference_text']} (similarity: {similarity:.3f})")
-                    
-                    return result['preferences']
-                else:
-                    print(f"  ❌ Search failed: {response.text}")
-                    return []
-                    
-            except Exception as e:
-                print(f"  ❌ Search error: {e}")
+                return result['preferences']
+            else:
+                print(f"  ❌ Search failed: {response.text}")
                 return []
+                
+        except Exception as e:
+            print(f"  ❌ Search error: {e}")
+            return []
     
     async def track_coding_signals(self) -> None:
         """Track some example coding signals (behaviors)."""
@@ -193,54 +226,73 @@ class CodingPreferencesDemo:
             }
         ]
         
-        async with httpx.AsyncClient() as client:
-            for signal in signals:
-                try:
-                    response = await client.post(
-                        f"{self.api_base_url}/coding-preferences/signals",
-                        headers={
-                            "Authorization": f"Bearer {self.auth_token}",
-                            "Content-Type": "application/json"
-                        },
-                        json=signal
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        print(f"  ✅ Tracked: {signal['signal_type']}")
-                    else:
-                        print(f"  ❌ Failed to track: {signal['signal_type']} - {response.text}")
-                        
-                except Exception as e:
-                    print(f"  ❌ Error tracking signal: {e}")
+        # One request for the whole batch; older servers lack /signals/bulk
+        try:
+            response = await self._client.post(
+                f"{self.api_base_url}/coding-preferences/signals/bulk",
+                headers={
+                    "Authorization": f"Bearer {self.auth_token}",
+                    "Content-Type": "application/json"
+                },
+                json={"items": signals}
+            )
+            
+            if response.status_code == 200:
+                for signal in signals:
+                    print(f"  ✅ Tracked: {signal['signal_type']}")
+                return
+            elif response.status_code != 404:
+                print(f"  ❌ Failed to track signals: {response.text}")
+                return
+                
+        except Exception as e:
+            print(f"  ❌ Error tracking signals: {e}")
+            return
+        
+        # Fall back to one POST per signal, sent concurrently
+        headers = {
+            "Authorization": f"Bearer {self.auth_token}",
+            "Content-Type": "application/json"
+        }
+        responses = await asyncio.gather(*[
+            self._client.post(f"{self.api_base_url}/coding-preferences/signals", headers=headers, json=signal)
+            for signal in signals
+        ], return_exceptions=True)
+        
+        for signal, response in zip(signals, responses):
+            if isinstance(response, Exception):
+                print(f"  ❌ Error tracking signal: {response}")
+            elif response.status_code == 200:
+                print(f"  ✅ Tracked: {signal['signal_type']}")
+            else:
+                print(f"  ❌ Failed to track: {signal['signal_type']} - {response.text}")
     
     async def get_coding_style_summary(self) -> None:
         """Get a summary of coding style preferences."""
         print("\n📈 Getting coding style summary...")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.api_base_url}/coding-preferences/summary",
-                    headers={
-                        "Authorization": f"Bearer {self.auth_token}",
-                        "Content-Type": "application/json"
-                    }
-                )
+        try:
+            response = await self._client.get(
+                f"{self.api_base_url}/coding-preferences/summary",
+                headers={
+                    "Authorization": f"Bearer {self.auth_token}",
+                    "Content-Type": "application/json"
+                }
+            )
+            
+            if response.status_code == 200:
+                summary = response.json()
+                print("  Coding Style Summary:")
                 
-                if response.status_code == 200:
-                    summary = response.json()
-                    print("  Coding Style Summary:")
-                    
-                    for item in summary:
-                        print(f"    {item['category']}: {item['preference_count']} preferences")
-                        for pref in item['top_preferences'][:2]:
-                            print(f"      - {pref}")
-                else:
-                    print(f"  ❌ Failed to get summary: {response.text}")
-                    
-            except Exception as e:
-                print(f"  ❌ Error getting summary: {e}")
+                for item in summary:
+                    print(f"    {item['category']}: {item['preference_count']} preferences")
+                    for pref in item['top_preferences'][:2]:
+                        print(f"      - {pref}")
+            else:
+                print(f"  ❌ Failed to get summary: {response.text}")
+                
+        except Exception as e:
+            print(f"  ❌ Error getting summary: {e}")
     
     async def run_demo(self) -> None:
         """Run the complete demo."""
@@ -271,9 +323,15 @@ class CodingPreferencesDemo:
 
 async def main():
     """Main function to run the demo."""
-    demo = CodingPreferencesDemo(API_BASE_URL, supabase)
-    await demo.run_demo()
+    async with CodingPreferencesDemo(API_BASE_URL, get_supabase()) as demo:
+        await demo.run_demo()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Reuse the CLI's runner (uvloop when installed) from the backend package
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+    from cli.main import _get_runner
+    
+    _get_runner().run(main())
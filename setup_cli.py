@@ -2,23 +2,28 @@
 """Setup script for Blueprinter CLI."""
 
 import os
+import shlex
 import subprocess
 import sys
 from pathlib import Path
 
-def run_command(command: str, cwd: Path = None) -> bool:
-    """Run a shell command and return success status."""
+def run_command(command: str, cwd: Path = None, quiet: bool = False) -> bool:
+    """Run a shell command and return success status.
+    
+    stdout streams straight to the terminal (or is discarded when quiet);
+    only stderr is captured, for the error report.
+    """
     try:
         result = subprocess.run(
             command,
             shell=True,
             cwd=cwd,
-            capture_output=True,
-            text=True
+            stdout=subprocess.DEVNULL if quiet else None,
+            stderr=subprocess.PIPE
         )
         if result.returncode != 0:
             print(f"Error running command: {command}")
-            print(f"Error output: {result.stderr}")
+            print(f"Error output: {result.stderr.decode(errors='replace')}")
             return False
         return True
     except Exception as e:
@@ -57,12 +62,12 @@ def main():
     
     # Install CLI dependencies
     print("\n🔧 Installing CLI dependencies...")
-    cli_deps = ["click>=8.1.0", "rich>=13.0.0", "httpx>=0.25.0"]
+    cli_deps = ["click>=8.1.0", "rich>=13.0.0", "httpx[http2]>=0.25.0", "orjson>=3.9.0", "pyperclip>=1.8.0"]
     
-    for dep in cli_deps:
-        if not run_command(f"pip install '{dep}'"):
-            print(f"❌ Failed to install {dep}")
-            sys.exit(1)
+    # One pip run resolves all of them together
+    if not run_command("pip install " + " ".join(shlex.quote(dep) for dep in cli_deps)):
+        print("❌ Failed to install CLI dependencies")
+        sys.exit(1)
     
     # Create CLI configuration directory
     config_dir = Path.home() / ".blueprinter"
@@ -71,7 +76,7 @@ def main():
     
     # Test CLI installation
     print("\n🧪 Testing CLI installation...")
-    if run_command("blueprinter --help"):
+    if run_command("blueprinter --help", quiet=True):
         print("✅ CLI installed successfully!")
     else:
         print("❌ CLI test failed. Please check the installation.")
@@ -0,0 +1,39 @@
+-- Similarity search over learned preference patterns
+-- Lets PatternLearningService rank patterns in the database (using the
+-- existing idx_preference_patterns_embedding HNSW index) instead of pulling
+-- every embedding into Python.
+
+CREATE OR REPLACE FUNCTION find_similar_patterns(
+    user_id_param UUID,
+    query_embedding VECTOR(1536),
+    similarity_threshold FLOAT DEFAULT 0.6,
+    max_results INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+    id UUID,
+    pattern_name TEXT,
+    pattern_description TEXT,
+    pattern_data JSONB,
+    confidence_score FLOAT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        pp.id,
+        pp.pattern_name,
+        pp.pattern_description,
+        pp.pattern_data,
+        pp.confidence_score,
+        1 - (pp.embedding <=> query_embedding) as similarity
+    FROM preference_patterns pp
+    WHERE pp.user_id = user_id_param
+        AND pp.embedding IS NOT NULL
+        AND 1 - (pp.embedding <=> query_embedding) > similarity_threshold
+    -- Order by raw distance so the planner can use the HNSW index
+    ORDER BY pp.embedding <=> query_embedding
+    LIMIT max_results;
+END;
+$$;
@@ -0,0 +1,13 @@
+-- One learned pattern per (user, pattern name)
+-- Lets PatternLearningService store patterns with a single upsert instead of
+-- a SELECT followed by INSERT or UPDATE.
+
+-- Keep only the most recently updated row of any existing duplicates
+DELETE FROM preference_patterns a
+    USING preference_patterns b
+WHERE a.user_id = b.user_id
+    AND a.pattern_name = b.pattern_name
+    AND (a.updated_at, a.id) < (b.updated_at, b.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS preference_patterns_user_name_uniq
+    ON preference_patterns(user_id, pattern_name);
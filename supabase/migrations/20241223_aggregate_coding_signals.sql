@@ -0,0 +1,81 @@
+-- Server-side aggregation of coding signals for pattern learning
+-- Returns one row per (signal_type, group key) that meets the same frequency
+-- thresholds PatternLearningService applies, so only aggregates cross the wire.
+
+CREATE INDEX IF NOT EXISTS idx_coding_signals_user_type_created
+    ON coding_signals(user_id, signal_type, created_at);
+
+CREATE OR REPLACE FUNCTION aggregate_coding_signals(
+    user_id_param UUID,
+    since TIMESTAMP WITH TIME ZONE
+)
+RETURNS TABLE (
+    signal_type TEXT,
+    group_key TEXT,
+    frequency BIGINT,
+    details TEXT[]
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    -- file_created: grouped by extension, details are the file paths
+    SELECT 
+        'file_created'::TEXT,
+        lower(regexp_replace(cs.signal_data->>'file_path', '^.*\.', '')),
+        COUNT(*),
+        ARRAY_AGG(cs.signal_data->>'file_path' ORDER BY cs.created_at)
+    FROM coding_signals cs
+    WHERE cs.user_id = user_id_param
+        AND cs.created_at >= since
+        AND cs.signal_type = 'file_created'
+        AND cs.signal_data->>'file_path' LIKE '%.%'
+    GROUP BY 2
+    HAVING COUNT(*) >= 3
+    
+    UNION ALL
+    
+    -- code_pattern_used: grouped by pattern type, details are the contexts
+    SELECT 
+        'code_pattern_used'::TEXT,
+        COALESCE(cs.signal_data->>'pattern_type', 'unknown'),
+        COUNT(*),
+        ARRAY_AGG(COALESCE(cs.signal_data->>'context', '') ORDER BY cs.created_at)
+    FROM coding_signals cs
+    WHERE cs.user_id = user_id_param
+        AND cs.created_at >= since
+        AND cs.signal_type = 'code_pattern_used'
+    GROUP BY 2
+    HAVING COUNT(*) >= 2
+    
+    UNION ALL
+    
+    -- refactor_applied: grouped by refactor type, details are the triggers
+    SELECT 
+        'refactor_applied'::TEXT,
+        COALESCE(cs.signal_data->>'refactor_type', 'unknown'),
+        COUNT(*),
+        ARRAY_AGG(COALESCE(cs.signal_data->>'trigger', '') ORDER BY cs.created_at)
+    FROM coding_signals cs
+    WHERE cs.user_id = user_id_param
+        AND cs.created_at >= since
+        AND cs.signal_type = 'refactor_applied'
+    GROUP BY 2
+    HAVING COUNT(*) >= 2
+    
+    UNION ALL
+    
+    -- test_written: grouped by test type, details are the frameworks
+    SELECT 
+        'test_written'::TEXT,
+        COALESCE(cs.signal_data->>'test_type', 'unknown'),
+        COUNT(*),
+        ARRAY_AGG(COALESCE(cs.signal_data->>'framework', '') ORDER BY cs.created_at)
+    FROM coding_signals cs
+    WHERE cs.user_id = user_id_param
+        AND cs.created_at >= since
+        AND cs.signal_type = 'test_written'
+    GROUP BY 2
+    HAVING COUNT(*) >= 2;
+END;
+$$;